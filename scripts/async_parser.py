@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - API asyncio du parser
+Parsing non bloquant pour les services Python : le travail CPU part dans un pool de processus partagé
+"""
+
+import os
+import time
+import asyncio
+import logging
+import tempfile
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import AsyncIterator, Iterable, NamedTuple, Optional, Union
+
+from cv_models import ParsedCV
+from parse_budget import DEFAULT_TIME_BUDGET
+from pdf_parser_improved import ImprovedCVParser
+
+logger = logging.getLogger(__name__)
+
+# Un chemin de fichier PDF, ou le contenu brut du PDF
+Source = Union[str, os.PathLike, bytes]
+
+
+class ParseOutcome(NamedTuple):
+    """Résultat d'un document de parse_many_async"""
+    index: int                       # position dans l'itérable d'entrée
+    source: Source
+    result: Optional[ParsedCV]       # modèle typé ; to_dict() donne le JSON du parser
+    error: Optional[BaseException]   # None si le parsing a réussi
+    seconds: float
+
+
+# Pool de processus partagé par tous les appels (créé au premier usage)
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_executor(max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+    """Pool de processus partagé ; max_workers n'est pris en compte qu'à la création"""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=max_workers)
+    return _executor
+
+
+def shutdown_executor(wait: bool = True) -> None:
+    """Arrête le pool partagé (à l'arrêt du service)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=wait)
+        _executor = None
+
+
+# Côté worker : un parser par thread, réutilisé entre les documents. Le parser garde le budget
+# du document en cours sur l'instance : deux threads ne doivent jamais partager la même
+# (executor= accepte aussi un pool de threads)
+_worker_state = threading.local()
+
+
+def _worker_parser(time_budget: Optional[float]) -> ImprovedCVParser:
+    parser = getattr(_worker_state, 'parser', None)
+    if parser is None:
+        parser = _worker_state.parser = ImprovedCVParser(time_budget=time_budget)
+    # Budget propre à l'appel : un seul parser par thread, quel que soit le timeout demandé
+    parser.time_budget = time_budget
+    return parser
+
+
+def _parse_in_worker(source: Source, time_budget: Optional[float]) -> ParsedCV:
+    parser = _worker_parser(time_budget)
+
+    # Le modèle typé est renvoyé tel quel : l'appelant ne le sérialise qu'en sortie (to_dict)
+    if not isinstance(source, bytes):
+        return parser.parse_cv_model(os.fspath(source))
+
+    # Contenu brut : passage par un fichier temporaire, supprimé après parsing
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+        temp_file.write(source)
+    try:
+        return parser.parse_cv_model(temp_file.name)
+    finally:
+        os.unlink(temp_file.name)
+
+
+def _worker_budget(timeout: Optional[float]) -> Optional[float]:
+    """Le worker s'arrête de lui-même peu après l'expiration du timeout de l'appelant"""
+    return min(timeout, DEFAULT_TIME_BUDGET) if timeout else DEFAULT_TIME_BUDGET
+
+
+async def parse_cv_async(source: Source, *, timeout: Optional[float] = None,
+                         executor: Optional[Executor] = None) -> ParsedCV:
+    """Parse un CV sans bloquer la boucle d'événements ; to_dict() sur le résultat donne le JSON du parser
+
+    Lève asyncio.TimeoutError après `timeout` secondes. Une annulation retire le document
+    du pool s'il n'a pas encore démarré ; un document déjà en cours se termine dans son
+    worker (borné par le budget de temps), son résultat est ignoré.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(executor or get_executor(), _parse_in_worker, source, _worker_budget(timeout))
+    return await asyncio.wait_for(future, timeout)
+
+
+async def parse_many_async(sources: Iterable[Source], concurrency: int = 4, *,
+                           timeout: Optional[float] = None,
+                           executor: Optional[Executor] = None) -> AsyncIterator[ParseOutcome]:
+    """Parse une suite de CVs, au plus `concurrency` à la fois, et les renvoie dans l'ordre d'achèvement
+
+    Les sources sont consommées à la demande : un itérable de milliers de documents ne crée
+    jamais plus de `concurrency` tâches. Une erreur ou un timeout sur un document est renvoyé
+    dans son ParseOutcome sans interrompre les autres. Quitter la boucle (break, annulation)
+    annule les documents en attente.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency doit être >= 1")
+
+    async def run(index: int, source: Source) -> ParseOutcome:
+        started = time.monotonic()
+        try:
+            result = await parse_cv_async(source, timeout=timeout, executor=executor)
+            return ParseOutcome(index, source, result, None, time.monotonic() - started)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Échec du parsing du document {index}: {e!r}")
+            return ParseOutcome(index, source, None, e, time.monotonic() - started)
+
+    pending = set()
+    source_iterator = enumerate(sources)
+    try:
+        while True:
+            for index, source in source_iterator:
+                pending.add(asyncio.ensure_future(run(index, source)))
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Ingestion par lots reprenable
+Parse une archive de CVs PDF avec un point de reprise SQLite : un redémarrage ne reparse que
+les fichiers nouveaux, modifiés ou en échec
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import logging
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from cv_models import ParsedCV
+from parse_budget import DEFAULT_TIME_BUDGET
+from pdf_reader import PdfBackendUnavailable
+
+# Configuration du logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+STATUS_DONE = 'done'
+# Budget de temps épuisé : résultat conservé tel quel. Un nouvel essai avec le même budget
+# expirerait de la même façon : le fichier n'est reparsé que s'il change
+STATUS_PARTIAL = 'partial'
+STATUS_FAILED = 'failed'
+# Essai en cours, enregistré avant le parsing : resté tel quel au démarrage suivant, le
+# processus est mort pendant cet essai (segfault, mémoire, kill) et l'essai compte comme échoué
+STATUS_RUNNING = 'running'
+
+CHECKPOINT_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    seconds REAL,
+    error TEXT,
+    chunk TEXT,
+    updated_at REAL NOT NULL
+)
+"""
+
+
+def file_sha256(path: Path) -> str:
+    """Empreinte SHA-256 d'un fichier, lu par blocs"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def is_empty_result(result: ParsedCV) -> bool:
+    """Aucune donnée extraite : PDF illisible (read_pdf n'en laisse rien paraître) ou sans texte"""
+    return not result.personal_info.to_dict() and not any(
+        (result.experiences, result.education, result.skills, result.languages))
+
+
+def is_partial_result(result: ParsedCV) -> bool:
+    """Résultat tronqué par le budget de temps"""
+    return bool((result.meta or {}).get('partial'))
+
+
+class Checkpoint:
+    """Point de reprise SQLite : un enregistrement par fichier (empreinte, statut, durée)"""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(db_path))
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(CHECKPOINT_SCHEMA)
+        self.connection.commit()
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Tous les enregistrements, indexés par chemin (une seule requête au démarrage)"""
+        cursor = self.connection.execute(
+            'SELECT path, sha256, size, mtime_ns, status, attempts FROM files'
+        )
+        columns = [column[0] for column in cursor.description]
+        return {row[0]: dict(zip(columns, row)) for row in cursor}
+
+    def record(self, path: str, sha256: str, stat: os.stat_result, status: str, attempts: int,
+               seconds: Optional[float] = None, error: Optional[str] = None, chunk: Optional[str] = None) -> None:
+        self.connection.execute(
+            'INSERT OR REPLACE INTO files '
+            '(path, sha256, size, mtime_ns, status, attempts, seconds, error, chunk, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (path, sha256, stat.st_size, stat.st_mtime_ns, status, attempts, seconds, error, chunk, time.time())
+        )
+        self.connection.commit()
+
+    def touch(self, path: str, stat: os.stat_result) -> None:
+        """Fichier réécrit à l'identique : seule la date de modification change"""
+        self.connection.execute(
+            'UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?',
+            (stat.st_size, stat.st_mtime_ns, path)
+        )
+        self.connection.commit()
+
+    def set_status(self, path: str, status: str, error: Optional[str] = None) -> None:
+        self.connection.execute(
+            'UPDATE files SET status = ?, error = ?, updated_at = ? WHERE path = ?',
+            (status, error, time.time(), path)
+        )
+        self.connection.commit()
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ResultChunkWriter:
+    """Résultats en fichiers JSONL append-only (results-000001.jsonl, ...)
+
+    Un redémarrage ouvre toujours un nouveau fichier : un fichier écrit n'est jamais rouvert.
+    Un crash entre l'écriture d'une ligne et le point de reprise peut dupliquer un résultat
+    dans le fichier suivant ; les lecteurs gardent la dernière ligne par chemin.
+    """
+
+    def __init__(self, output_dir: Path, chunk_size: int = 500):
+        self.output_dir = output_dir
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_size = chunk_size
+        existing = sorted(self.output_dir.glob('results-*.jsonl'))
+        self._next_index = int(existing[-1].stem.split('-')[1]) + 1 if existing else 1
+        self._file = None
+        self._lines = 0
+        self.current_chunk: Optional[str] = None
+
+    def write(self, record: Dict[str, Any]) -> str:
+        """Ajoute une ligne et retourne le nom du fichier qui la contient"""
+        if self._file is None or self._lines >= self.chunk_size:
+            self._open_next()
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        self._lines += 1
+        return self.current_chunk
+
+    def _open_next(self) -> None:
+        self.close()
+        self.current_chunk = f'results-{self._next_index:06d}.jsonl'
+        self._file = open(self.output_dir / self.current_chunk, 'x', encoding='utf-8')
+        self._next_index += 1
+        self._lines = 0
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class BatchIngestor:
+    """Parse une liste de fichiers en s'appuyant sur le point de reprise"""
+
+    def __init__(self, parse: Callable[[str], ParsedCV], checkpoint: Checkpoint,
+                 writer: ResultChunkWriter, max_attempts: int = 3,
+                 sinks: Optional[List[Any]] = None):
+        self.parse = parse
+        self.checkpoint = checkpoint
+        self.writer = writer
+        self.max_attempts = max_attempts
+        # Destinations supplémentaires : objets exposant write(path, sha256, result), flush() et pending,
+        # le nombre de CVs reçus mais pas encore écrits sur disque
+        self.sinks = sinks or []
+        # Fichiers parsés dont le point de reprise attend l'écriture des exports
+        self._deferred: List[Tuple] = []
+
+    def run(self, paths: Iterable[Path]) -> Dict[str, int]:
+        records = self.checkpoint.load()
+        summary = {'parsed': 0, 'skipped': 0, 'failed': 0}
+
+        try:
+            for path in paths:
+                key = str(path)
+                stat = path.stat()
+                record = records.get(key)
+
+                # Taille et date inchangées : pas besoin de relire le fichier
+                if record and record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+                    if self._is_settled(record):
+                        summary['skipped'] += 1
+                        continue
+                    sha256 = record['sha256']
+                else:
+                    sha256 = file_sha256(path)
+                    if record and record['sha256'] == sha256 and self._is_settled(record):
+                        self.checkpoint.touch(key, stat)
+                        summary['skipped'] += 1
+                        continue
+
+                # Un fichier modifié repart avec un compteur d'essais à zéro
+                attempts = record['attempts'] if record and record['sha256'] == sha256 else 0
+                if attempts and record['status'] == STATUS_RUNNING:
+                    logger.warning(f"⚠️ {key} interrompu pendant l'essai {attempts}/{self.max_attempts}")
+                summary[self._ingest(path, sha256, stat, attempts)] += 1
+        finally:
+            for sink in self.sinks:
+                sink.flush()
+            self._record_exported()
+
+        logger.info(f"📦 Lot terminé: {summary['parsed']} parsés, {summary['skipped']} ignorés, "
+                    f"{summary['failed']} en échec")
+        return summary
+
+    def _is_settled(self, record: Dict[str, Any]) -> bool:
+        """Déjà parsé (éventuellement partiel), ou en échec après le nombre maximal d'essais"""
+        if record['status'] in (STATUS_DONE, STATUS_PARTIAL):
+            return True
+        if record['attempts'] < self.max_attempts:
+            return False
+        if record['status'] == STATUS_RUNNING:
+            # Dernier essai interrompu : enregistré comme un échec
+            self.checkpoint.set_status(record['path'], STATUS_FAILED, "Interrompu pendant le parsing")
+            record['status'] = STATUS_FAILED
+            logger.error(f"❌ {record['path']} abandonné après {record['attempts']} essais interrompus")
+        return True
+
+    def _ingest(self, path: Path, sha256: str, stat: os.stat_result, attempts: int) -> str:
+        key = str(path)
+        error = None
+        while attempts < self.max_attempts:
+            attempts += 1
+            # Essai enregistré avant le parsing : un crash du processus le compte quand même
+            self.checkpoint.record(key, sha256, stat, STATUS_RUNNING, attempts, error=error)
+            started = time.monotonic()
+            try:
+                result = self.parse(key)
+            except PdfBackendUnavailable:
+                # Aucun fichier ne pourra être parsé : inutile de brûler les essais
+                self.checkpoint.record(key, sha256, stat, STATUS_RUNNING, attempts - 1, error=error)
+                raise
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                logger.warning(f"⚠️ Essai {attempts}/{self.max_attempts} échoué pour {key}: {error}")
+                continue
+            seconds = time.monotonic() - started
+            if is_empty_result(result):
+                error = "Aucune donnée extraite"
+                logger.warning(f"⚠️ Essai {attempts}/{self.max_attempts} échoué pour {key}: {error}")
+                continue
+            partial = is_partial_result(result)
+            # Le modèle n'est sérialisé qu'ici, à l'écriture du JSONL
+            chunk = self.writer.write({'path': key, 'sha256': sha256, 'result': result.to_dict()})
+            for sink in self.sinks:
+                sink.write(key, sha256, result)
+            if partial:
+                error = "Résultat partiel: budget de temps épuisé"
+                self._deferred.append((key, sha256, stat, STATUS_PARTIAL, attempts, seconds, error, chunk))
+                logger.warning(f"⚠️ {key} parsé partiellement en {seconds:.2f}s")
+            else:
+                self._deferred.append((key, sha256, stat, STATUS_DONE, attempts, seconds, None, chunk))
+                logger.info(f"✅ {key} parsé en {seconds:.2f}s")
+            self._record_exported()
+            return 'parsed'
+
+        self.checkpoint.record(key, sha256, stat, STATUS_FAILED, attempts, error=error)
+        logger.error(f"❌ {key} abandonné après {attempts} essais")
+        return 'failed'
+
+    def _record_exported(self) -> None:
+        """Enregistre les fichiers parsés dès que tous les exports ont écrit leurs lignes sur disque
+
+        Un export tamponné (lots Parquet) ne doit pas perdre de CV en cas d'arrêt brutal : tant
+        qu'il garde des lignes en attente, les fichiers restent à reparser au prochain lancement.
+        """
+        if not self._deferred or any(sink.pending for sink in self.sinks):
+            return
+        for key, sha256, stat, status, attempts, seconds, error, chunk in self._deferred:
+            self.checkpoint.record(key, sha256, stat, status, attempts, seconds, error=error, chunk=chunk)
+        self._deferred = []
+
+
+def find_pdfs(archive_dir: Path) -> List[Path]:
+    """PDFs de l'archive, dans un ordre stable"""
+    return sorted(path for path in archive_dir.rglob('*') if path.suffix.lower() == '.pdf' and path.is_file())
+
+
+def main():
+    """Fonction principale pour utilisation en ligne de commande"""
+    parser = argparse.ArgumentParser(description='Ingestion par lots reprenable de CVs PDF pour CV Genius')
+    parser.add_argument('archive_dir', help='Dossier contenant les CVs PDF (parcouru récursivement)')
+    parser.add_argument('--output-dir', '-o', default='batch_output', help='Dossier des résultats JSONL')
+    parser.add_argument('--checkpoint', help='Base SQLite de reprise (défaut: <output-dir>/checkpoint.sqlite)')
+    parser.add_argument('--max-attempts', type=int, default=3, help="Nombre maximal d'essais par fichier")
+    parser.add_argument('--chunk-size', type=int, default=500, help='Nombre de résultats par fichier JSONL')
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET,
+                        help='Budget de temps par document en secondes (0 : illimité)')
+    parser.add_argument('--dedup-index',
+                        help='Base SQLite des CVs déjà parsés : les quasi-doublons réutilisent les sections inchangées')
+    parser.add_argument('--export-format', choices=['auto', 'parquet', 'arrow', 'sqlite'],
+                        help='Export en tables normalisées (auto : Parquet si pyarrow est installé, SQLite sinon)')
+    parser.add_argument('--export-dir', help='Dossier de l\'export (défaut: <output-dir>/export)')
+    parser.add_argument('--compact-export', action='store_true',
+                        help="Regroupe l'export en fin de lot, sans les lignes des CVs reparsés ou modifiés")
+    parser.add_argument('--verbose', '-v', action='store_true', help='Mode verbose')
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    archive_dir = Path(args.archive_dir)
+    if not archive_dir.is_dir():
+        logger.error(f"❌ Dossier non trouvé: {args.archive_dir}")
+        sys.exit(1)
+
+    from pdf_parser_improved import ImprovedCVParser
+
+    output_dir = Path(args.output_dir)
+    checkpoint = Checkpoint(Path(args.checkpoint) if args.checkpoint else output_dir / 'checkpoint.sqlite')
+    writer = ResultChunkWriter(output_dir, chunk_size=args.chunk_size)
+    duplicate_index = None
+    if args.dedup_index:
+        from near_duplicates import NearDuplicateIndex
+        duplicate_index = NearDuplicateIndex(Path(args.dedup_index))
+    sinks = []
+    if args.export_format:
+        from columnar_export import open_export_sink
+        # Lots d'export de la taille des fichiers JSONL : au plus chunk_size CVs à reparser après un arrêt brutal
+        sinks.append(open_export_sink(Path(args.export_dir) if args.export_dir else output_dir / 'export',
+                                      args.export_format, batch_size=args.chunk_size))
+    cv_parser = ImprovedCVParser(time_budget=args.time_budget, duplicate_index=duplicate_index)
+    try:
+        ingestor = BatchIngestor(cv_parser.parse_cv_model, checkpoint, writer, max_attempts=args.max_attempts,
+                                 sinks=sinks)
+        summary = ingestor.run(find_pdfs(archive_dir))
+        if args.compact_export:
+            for sink in sinks:
+                sink.compact()
+    except PdfBackendUnavailable as e:
+        logger.error(f"❌ {e}")
+        sys.exit(2)
+    finally:
+        for sink in sinks:
+            sink.close()
+        writer.close()
+        checkpoint.close()
+        if duplicate_index is not None:
+            duplicate_index.close()
+
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Export en colonnes des résultats de parsing
+Tables normalisées (cvs, experiences, education, skills, languages) écrites au fil d'un lot :
+Parquet ou Arrow IPC si pyarrow est installé, SQLite sinon
+"""
+
+import os
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from cv_models import ParsedCV
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('auto', 'parquet', 'arrow', 'sqlite')
+
+# Colonnes de chaque table : (nom, type) avec type 'text' ou 'bool'
+# cv_id est l'empreinte SHA-256 du PDF : elle relie les tables entre elles
+TABLE_COLUMNS: Dict[str, List[Tuple[str, str]]] = {
+    'cvs': [
+        ('cv_id', 'text'), ('path', 'text'), ('name', 'text'), ('email', 'text'),
+        ('location', 'text'), ('partial', 'bool'),
+    ],
+    'experiences': [
+        ('cv_id', 'text'), ('position', 'text'), ('company', 'text'), ('location', 'text'),
+        ('start_date', 'text'), ('end_date', 'text'), ('is_current', 'bool'), ('description', 'text'),
+    ],
+    'education': [
+        ('cv_id', 'text'), ('degree', 'text'), ('institution', 'text'), ('field', 'text'),
+        ('start_date', 'text'), ('end_date', 'text'),
+    ],
+    'skills': [
+        ('cv_id', 'text'), ('name', 'text'), ('category', 'text'), ('level', 'text'),
+    ],
+    'languages': [
+        ('cv_id', 'text'), ('name', 'text'), ('level', 'text'),
+    ],
+}
+
+# Colonne de table -> attribut du modèle (cv_models) quand les noms diffèrent
+_MODEL_ATTRIBUTES = {
+    'is_current': 'is_current_position',
+}
+
+
+def _row(table: str, cv_id: str, item: Any) -> Tuple:
+    row = [cv_id]
+    for column, column_type in TABLE_COLUMNS[table][1:]:
+        value = getattr(item, _MODEL_ATTRIBUTES.get(column, column))
+        if column_type == 'bool':
+            row.append(bool(value))
+        else:
+            row.append(str(value) if value not in (None, '') else None)
+    return tuple(row)
+
+
+def result_rows(cv_id: str, path: str, result: ParsedCV) -> Dict[str, List[Tuple]]:
+    """Lignes de chaque table pour un CV parsé (une ligne par expérience, formation...)"""
+    personal_info = result.personal_info
+    meta = result.meta or {}
+    return {
+        'cvs': [(
+            cv_id, path,
+            personal_info.name or None,
+            personal_info.email or None,
+            personal_info.location or None,
+            bool(meta.get('partial')),
+        )],
+        'experiences': [_row('experiences', cv_id, item) for item in result.experiences],
+        'education': [_row('education', cv_id, item) for item in result.education],
+        'skills': [_row('skills', cv_id, item) for item in result.skills],
+        'languages': [_row('languages', cv_id, item) for item in result.languages],
+    }
+
+
+class SqliteSink:
+    """Tables normalisées dans une base SQLite (repli sans pyarrow)"""
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(db_path))
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        sql_types = {'text': 'TEXT', 'bool': 'INTEGER'}
+        for table, columns in TABLE_COLUMNS.items():
+            definition = ', '.join(f'{name} {sql_types[column_type]}' for name, column_type in columns)
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} ({definition})')
+            self.connection.execute(f'CREATE INDEX IF NOT EXISTS {table}_by_cv ON {table} (cv_id)')
+        self.connection.commit()
+
+    def write(self, path: str, sha256: str, result: ParsedCV) -> None:
+        """Remplace les lignes du CV (un CV reparsé n'est jamais compté deux fois)
+
+        Les lignes d'une version précédente du fichier (même chemin, autre empreinte) sont
+        supprimées aussi : un fichier modifié remplace son ancienne version.
+        """
+        with self.connection:
+            superseded = [row[0] for row in self.connection.execute(
+                'SELECT cv_id FROM cvs WHERE path = ? AND cv_id != ?', (path, sha256))]
+            for table, rows in result_rows(sha256, path, result).items():
+                for cv_id in [sha256] + superseded:
+                    self.connection.execute(f'DELETE FROM {table} WHERE cv_id = ?', (cv_id,))
+                if rows:
+                    placeholders = ', '.join('?' * len(TABLE_COLUMNS[table]))
+                    self.connection.executemany(f'INSERT INTO {table} VALUES ({placeholders})', rows)
+
+    @property
+    def pending(self) -> int:
+        """CVs reçus mais pas encore écrits : aucun, chaque écriture est validée aussitôt"""
+        return 0
+
+    def flush(self) -> None:
+        pass
+
+    def compact(self) -> None:
+        """Rend au disque la place des lignes remplacées"""
+        self.connection.execute('VACUUM')
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+class ArrowSink:
+    """Tables normalisées en fichiers Parquet ou Arrow IPC, un dossier par table
+
+    Les lignes sont regroupées par lots de batch_size CVs ; chaque lot ajoute un fichier
+    part-NNNNNN à chaque table, sans jamais réécrire les précédents. Le dossier d'une table
+    se lit comme un seul jeu de données (pyarrow.dataset), en ne chargeant que les colonnes
+    utiles. Un CV reparsé ajoute de nouvelles lignes : dédupliquer sur cv_id et sur path dans
+    la table cvs (la dernière partie l'emporte), ou appeler compact().
+
+    Chaque fichier est écrit sous un nom temporaire (préfixe '.', ignoré par pyarrow.dataset)
+    puis renommé : un arrêt brutal ne laisse jamais de partie tronquée dans le jeu de données.
+    """
+
+    def __init__(self, output_dir: Path, file_format: str = 'parquet', batch_size: int = 1000):
+        import pyarrow as pa
+
+        self.output_dir = output_dir
+        self.file_format = file_format
+        self.batch_size = batch_size
+        arrow_types = {'text': pa.string(), 'bool': pa.bool_()}
+        self.schemas = {
+            table: pa.schema([(name, arrow_types[column_type]) for name, column_type in columns])
+            for table, columns in TABLE_COLUMNS.items()
+        }
+        self.extension = '.parquet' if file_format == 'parquet' else '.arrow'
+        for table in TABLE_COLUMNS:
+            (self.output_dir / table).mkdir(parents=True, exist_ok=True)
+            # Écritures interrompues par un arrêt brutal
+            for temp_path in (self.output_dir / table).glob('.part-*.tmp'):
+                temp_path.unlink()
+        existing = self._parts('cvs')
+        self._next_part = int(existing[-1].stem.split('-')[1]) + 1 if existing else 1
+        self._pending: Dict[str, List[Tuple]] = {table: [] for table in TABLE_COLUMNS}
+        self._pending_keys: Set[str] = set()
+        self._pending_cvs = 0
+
+    def write(self, path: str, sha256: str, result: ParsedCV) -> None:
+        # Un CV ou un chemin apparaît au plus une fois par partie : compact() garde la dernière
+        if sha256 in self._pending_keys or path in self._pending_keys:
+            self.flush()
+        for table, rows in result_rows(sha256, path, result).items():
+            self._pending[table].extend(rows)
+        self._pending_keys.update((sha256, path))
+        self._pending_cvs += 1
+        if self._pending_cvs >= self.batch_size:
+            self.flush()
+
+    @property
+    def pending(self) -> int:
+        """CVs reçus mais pas encore écrits sur disque (perdus en cas d'arrêt brutal)"""
+        return self._pending_cvs
+
+    def flush(self) -> None:
+        """Écrit les lignes en attente dans un nouveau fichier de chaque table"""
+        if not self._pending_cvs:
+            return
+        import pyarrow as pa
+
+        part_name = f'part-{self._next_part:06d}{self.extension}'
+        for table, rows in self._pending.items():
+            schema = self.schemas[table]
+            columns = list(zip(*rows)) if rows else [[] for _ in schema]
+            batch = pa.table([pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                             schema=schema)
+            self._write_table(batch, self.output_dir / table / part_name)
+        logger.info(f"📊 Export {part_name}: {self._pending_cvs} CV(s)")
+        self._next_part += 1
+        self._pending = {table: [] for table in TABLE_COLUMNS}
+        self._pending_keys = set()
+        self._pending_cvs = 0
+
+    def _parts(self, table: str) -> List[Path]:
+        return sorted((self.output_dir / table).glob(f'part-*{self.extension}'))
+
+    def _write_table(self, table, file_path: Path) -> None:
+        """Écriture dans un fichier temporaire du même dossier, puis renommage atomique"""
+        temp_path = file_path.with_name(f'.{file_path.name}.tmp')
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, str(temp_path))
+        else:
+            import pyarrow as pa
+            with pa.OSFile(str(temp_path), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(temp_path, file_path)
+
+    def _read_table(self, file_path: Path):
+        if self.file_format == 'parquet':
+            import pyarrow.parquet as pq
+            return pq.read_table(str(file_path))
+        import pyarrow as pa
+        with pa.memory_map(str(file_path)) as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def compact(self) -> None:
+        """Regroupe les parties de chaque table en une seule, sans les lignes remplacées
+
+        Comme SqliteSink : un CV n'est gardé que dans sa dernière écriture, et un chemin que
+        pour sa dernière empreinte. La nouvelle partie est écrite avant la suppression des
+        anciennes : un arrêt entre les deux laisse des doublons, jamais de perte.
+        """
+        self.flush()
+        import pyarrow as pa
+
+        parts = {table: self._parts(table) for table in TABLE_COLUMNS}
+        if len(parts['cvs']) < 2:
+            return
+        # Dernière partie de chaque CV conservé, en parcourant les écritures dans l'ordre
+        latest_part: Dict[str, int] = {}
+        cv_by_path: Dict[str, str] = {}
+        path_by_cv: Dict[str, str] = {}
+        for index, part in enumerate(parts['cvs']):
+            for row in self._read_table(part).select(['cv_id', 'path']).to_pylist():
+                cv_id, path = row['cv_id'], row['path']
+                previous_cv = cv_by_path.get(path)
+                if previous_cv is not None and previous_cv != cv_id:
+                    # Ancienne version du fichier
+                    latest_part.pop(previous_cv, None)
+                    del path_by_cv[previous_cv]
+                previous_path = path_by_cv.get(cv_id)
+                if previous_path is not None and previous_path != path:
+                    # Même contenu sous un autre chemin : compté une fois, sous le dernier
+                    del cv_by_path[previous_path]
+                cv_by_path[path] = cv_id
+                path_by_cv[cv_id] = path
+                latest_part[cv_id] = index
+        part_index = {part.name: index for index, part in enumerate(parts['cvs'])}
+
+        part_name = f'part-{self._next_part:06d}{self.extension}'
+        for table, table_parts in parts.items():
+            kept = []
+            for part in table_parts:
+                index = part_index.get(part.name)
+                if index is None:
+                    # Partie sans table cvs (écriture interrompue) : ses CVs ont été réécrits depuis
+                    continue
+                data = self._read_table(part)
+                mask = [latest_part.get(cv_id) == index for cv_id in data.column('cv_id').to_pylist()]
+                kept.append(data.filter(pa.array(mask, type=pa.bool_())))
+            merged = pa.concat_tables(kept) if kept else self.schemas[table].empty_table()
+            self._write_table(merged, self.output_dir / table / part_name)
+        for table_parts in parts.values():
+            for part in table_parts:
+                part.unlink()
+        self._next_part += 1
+        logger.info(f"📊 Export compacté dans {part_name}: {len(latest_part)} CV(s)")
+
+    def close(self) -> None:
+        self.flush()
+
+
+def open_export_sink(output_dir: Path, file_format: str = 'auto', batch_size: int = 1000):
+    """Destination d'export pour BatchIngestor ; 'auto' choisit Parquet si pyarrow est installé, SQLite sinon"""
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError(f"Format d'export inconnu: {file_format}")
+    if file_format in ('auto', 'parquet', 'arrow'):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            if file_format != 'auto':
+                logger.warning(f"⚠️ pyarrow n'est pas installé: export {file_format} remplacé par SQLite")
+            file_format = 'sqlite'
+        else:
+            file_format = 'parquet' if file_format == 'auto' else file_format
+    if file_format == 'sqlite':
+        return SqliteSink(output_dir / 'cv_export.sqlite')
+    return ArrowSink(output_dir, file_format=file_format, batch_size=batch_size)
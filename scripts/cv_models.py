@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Modèle typé d'un CV parsé
+Classes à __slots__ calquées sur CVFormData (types/index.ts) : pas de dictionnaire par instance,
+et un sérialiseur direct vers le JSON existant (mêmes clés, même ordre)
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# Les champs n'ont pas de valeur par défaut : dataclass(slots=True) n'existe qu'à partir de
+# Python 3.10 (CI en 3.9), et une valeur par défaut entrerait en conflit avec __slots__
+
+
+@dataclass
+class PersonalInfo:
+    """Informations personnelles ; None : champ absent du JSON"""
+    __slots__ = ('name', 'email', 'phone', 'linkedin', 'website', 'location')
+    name: Optional[str]
+    email: Optional[str]
+    phone: Optional[str]
+    linkedin: Optional[str]
+    website: Optional[str]
+    location: Optional[str]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PersonalInfo':
+        return cls(data.get('name'), data.get('email'), data.get('phone'),
+                   data.get('linkedin'), data.get('website'), data.get('location'))
+
+    def to_dict(self) -> Dict[str, str]:
+        data = {}
+        if self.name is not None:
+            data['name'] = self.name
+        if self.email is not None:
+            data['email'] = self.email
+        if self.phone is not None:
+            data['phone'] = self.phone
+        if self.linkedin is not None:
+            data['linkedin'] = self.linkedin
+        if self.website is not None:
+            data['website'] = self.website
+        if self.location is not None:
+            data['location'] = self.location
+        return data
+
+
+@dataclass
+class Experience:
+    __slots__ = ('id', 'position', 'company', 'location', 'start_date', 'end_date',
+                 'description', 'is_current_position')
+    id: str
+    position: str
+    company: str
+    location: str
+    start_date: str
+    end_date: str
+    description: str
+    is_current_position: bool
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Experience':
+        return cls(data['id'], data['position'], data['company'], data['location'], data['startDate'],
+                   data['endDate'], data['description'], data['isCurrentPosition'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'position': self.position,
+            'company': self.company,
+            'location': self.location,
+            'startDate': self.start_date,
+            'endDate': self.end_date,
+            'description': self.description,
+            'isCurrentPosition': self.is_current_position,
+        }
+
+
+@dataclass
+class Education:
+    __slots__ = ('id', 'degree', 'institution', 'field', 'start_date', 'end_date', 'description')
+    id: str
+    degree: str
+    institution: str
+    field: str
+    start_date: str
+    end_date: str
+    description: str
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Education':
+        return cls(data['id'], data['degree'], data['institution'], data['field'],
+                   data['startDate'], data['endDate'], data['description'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'degree': self.degree,
+            'institution': self.institution,
+            'field': self.field,
+            'startDate': self.start_date,
+            'endDate': self.end_date,
+            'description': self.description,
+        }
+
+
+@dataclass
+class Skill:
+    __slots__ = ('id', 'name', 'category', 'level')
+    id: str
+    name: str
+    category: str  # 'technical' | 'soft' | 'language' | 'other'
+    level: str     # 'beginner' | 'intermediate' | 'advanced' | 'expert'
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Skill':
+        return cls(data['id'], data['name'], data['category'], data['level'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'name': self.name, 'category': self.category, 'level': self.level}
+
+
+@dataclass
+class Language:
+    __slots__ = ('id', 'name', 'level')
+    id: str
+    name: str
+    level: str  # 'A1' ... 'C2' | 'native'
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Language':
+        return cls(data['id'], data['name'], data['level'])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id, 'name': self.name, 'level': self.level}
+
+
+# Clé du résultat JSON -> modèle de ses éléments
+SECTION_MODELS = {
+    'experiences': Experience,
+    'education': Education,
+    'skills': Skill,
+    'languages': Language,
+}
+
+
+@dataclass
+class ParsedCV:
+    """CV parsé ; meta (budget, OCR, quasi-doublon) n'est sérialisé que s'il est non vide"""
+    __slots__ = ('personal_info', 'experiences', 'education', 'skills', 'languages', 'meta')
+    personal_info: PersonalInfo
+    experiences: List[Experience]
+    education: List[Education]
+    skills: List[Skill]
+    languages: List[Language]
+    meta: Optional[Dict[str, Any]]
+
+    @classmethod
+    def empty(cls) -> 'ParsedCV':
+        return cls(PersonalInfo(None, None, None, None, None, None), [], [], [], [], None)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ParsedCV':
+        return cls(
+            PersonalInfo.from_dict(data.get('personalInfo') or {}),
+            [Experience.from_dict(item) for item in data.get('experiences') or []],
+            [Education.from_dict(item) for item in data.get('education') or []],
+            [Skill.from_dict(item) for item in data.get('skills') or []],
+            [Language.from_dict(item) for item in data.get('languages') or []],
+            data.get('meta') or None,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Structure JSON du parser : personalInfo, experiences, education, skills, languages[, meta]"""
+        data = {
+            'personalInfo': self.personal_info.to_dict(),
+            'experiences': [item.to_dict() for item in self.experiences],
+            'education': [item.to_dict() for item in self.education],
+            'skills': [item.to_dict() for item in self.skills],
+            'languages': [item.to_dict() for item in self.languages],
+        }
+        if self.meta:
+            data['meta'] = self.meta
+        return data
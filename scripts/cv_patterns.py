@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Expressions régulières partagées
+Patterns appliqués à tout le document, audités pour un temps d'exécution linéaire
+
+Règles suivies :
+- chaque répétition d'une classe de caractères est bornée ({1,64} plutôt que +),
+  le travail par position de départ est donc constant ;
+- aucune répétition imbriquée ambiguë ((?:/[\\w-]*)* est remplacé par (?:/[\\w-]+)*) ;
+- les patterns lancés via findall ne démarrent qu'en début de mot (lookbehind),
+  un long mot sans point n'est donc parcouru qu'une seule fois.
+"""
+
+import re
+
+EMAIL_PATTERN = re.compile(r'\b[a-zA-Z0-9._%+-]{1,64}@[a-zA-Z0-9.-]{1,253}\.[a-zA-Z]{2,24}\b')
+
+PHONE_FR_PATTERN = re.compile(r'(?:\+33|0)\s?[1-9](?:[\s.-]?\d{2}){4}')
+PHONE_INTERNATIONAL_PATTERN = re.compile(r'\+?(?:\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}')
+PHONE_SIMPLE_PATTERN = re.compile(r'(?:\+\d{1,3}\s?)?\d{10,15}')
+
+LINKEDIN_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]{1,100}/?', re.IGNORECASE)
+# Accepte aussi la forme courte "in/pseudo" affichée sur certains CVs
+LINKEDIN_SHORT_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?(?:linkedin\.com/in/|\bin/)[\w-]{1,100}/?', re.IGNORECASE)
+GITHUB_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?github\.com/[\w-]{1,100}/?', re.IGNORECASE)
+DEPLOYED_SITE_PATTERN = re.compile(
+    r'https?://[\w.-]{1,253}\.(?:vercel\.app|onrender\.com|herokuapp\.com|netlify\.app)[\w/.-]{0,200}',
+    re.IGNORECASE
+)
+WEBSITE_PATTERN = re.compile(
+    r'(?<![\w.-])(?:https?://)?(?:www\.)?[\w-]{1,63}\.\w{2,24}(?:/[\w-]{1,100}){0,10}/?',
+    re.IGNORECASE
+)
+
+# Localisation : au plus quatre mots capitalisés sur une même ligne
+LOCATION_COUNTRY_PATTERN = re.compile(
+    r'\b([A-Z][a-z]{1,40}(?:[ \t]{1,5}[A-Z][a-z]{1,40}){0,3}),?[ \t]{0,5}(?:France|Vietnam)\b',
+    re.IGNORECASE
+)
+LOCATION_CAMPUS_PATTERN = re.compile(r'Campus\s{1,5}([A-Z][a-zA-Z ]{0,40})', re.IGNORECASE)
+LOCATION_INSA_PATTERN = re.compile(r'INSA\s{1,5}([A-Z][a-z]{1,40})', re.IGNORECASE)
+LOCATION_CITY_PATTERN = re.compile(r'\b([A-Z][a-z]{1,40}(?:[ \t]{1,5}[A-Z][a-z]{1,40}){0,3},?[ \t]{0,5}[A-Z][a-z]{1,40})')
+
+WORD_PATTERN = re.compile(r'\b\w+\b')
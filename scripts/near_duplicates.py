@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Index des CVs quasi identiques
+Signatures MinHash et buckets LSH persistés dans SQLite : un CV ré-exporté avec une retouche
+réutilise le résultat déjà parsé ; seuls les extracteurs dont les lignes lues ont changé sont relancés
+"""
+
+import copy
+import json
+import time
+import zlib
+import random
+import sqlite3
+import hashlib
+import logging
+import operator
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Set
+
+from cv_models import ParsedCV
+from text_normalizer import NormalizedText, fold_text
+
+logger = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 128
+BANDS = 16                           # 16 bandes de 8 lignes : candidat quasi certain dès 95 % de similarité,
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS  # rare sous 50 %
+SHINGLE_SIZE = 3                     # shingles de 3 mots
+DEFAULT_THRESHOLD = 0.95
+MAX_CANDIDATES = 8                   # candidats vérifiés par requête, les plus souvent dans les mêmes buckets
+
+_MERSENNE_PRIME = (1 << 61) - 1
+# Permutations fixées : les signatures restent comparables d'une exécution à l'autre
+_rng = random.Random(20240611)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+                 for _ in range(NUM_PERMUTATIONS)]
+
+# Format de l'index (PRAGMA user_version) : un index d'un autre format est reconstruit, c'est un cache
+INDEX_VERSION = 2
+
+INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    text_sha256 TEXT NOT NULL UNIQUE,
+    signature BLOB NOT NULL,
+    section_keys TEXT NOT NULL,
+    result BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    bucket INTEGER NOT NULL,
+    document_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_by_key ON buckets (bucket);
+"""
+
+
+def _hash64(data: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'big')
+
+
+def shingles(lines: List[str]) -> Set[int]:
+    """Empreintes des suites de SHINGLE_SIZE mots du texte replié (casse et accents ignorés)"""
+    words = fold_text(' '.join(lines)).split()
+    if len(words) < SHINGLE_SIZE:
+        return {_hash64(' '.join(words).encode())} if words else set()
+    return {_hash64(' '.join(words[i:i + SHINGLE_SIZE]).encode())
+            for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signature(lines: List[str]) -> array:
+    """Signature MinHash : minimum de chaque permutation sur l'ensemble des shingles"""
+    values = [value % _MERSENNE_PRIME for value in shingles(lines)]
+    if not values:
+        return array('Q', [_MERSENNE_PRIME] * NUM_PERMUTATIONS)
+    return array('Q', [min([(a * value + b) % _MERSENNE_PRIME for value in values])
+                       for a, b in _PERMUTATIONS])
+
+
+def band_keys(signature: array) -> List[int]:
+    """Clé de bucket de chaque bande (numéro de bande inclus), en entier signé 64 bits pour SQLite"""
+    keys = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(bytes([band]) + rows.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def similarity(left: array, right: array) -> float:
+    """Similarité de Jaccard estimée : part des permutations de même minimum"""
+    return sum(map(operator.eq, left, right)) / NUM_PERMUTATIONS
+
+
+class NearDuplicate(NamedTuple):
+    """Document déjà parsé jugé quasi identique"""
+    document_id: int
+    similarity: float
+    section_keys: Dict[str, str]
+    result: ParsedCV
+
+
+class ReusePlan(NamedTuple):
+    """Document à parser et sections reprises de son quasi-doublon"""
+    doc: NormalizedText
+    signature: array
+    section_keys: Dict[str, str]  # clé du résultat -> empreinte des lignes lues par son extracteur
+    reused: Dict[str, List[Any]]  # clé du résultat -> éléments (modèles) repris du document indexé
+    similarity: float           # 0.0 sans quasi-doublon
+
+
+class _Entry(NamedTuple):
+    signature: array
+    section_keys: Dict[str, str]
+    result: ParsedCV
+
+
+def _pack(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+
+class NearDuplicateIndex:
+    """Index LSH persistant (SQLite) ; seuls cache_size documents récents sont gardés en mémoire"""
+
+    def __init__(self, db_path: Path, threshold: float = DEFAULT_THRESHOLD, cache_size: int = 256):
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] != INDEX_VERSION:
+            self.connection.executescript('DROP TABLE IF EXISTS documents; DROP TABLE IF EXISTS buckets;')
+            self.connection.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+        self.connection.executescript(INDEX_SCHEMA)
+        self.connection.commit()
+        self.threshold = threshold
+        self.cache_size = cache_size
+        self._cache: 'OrderedDict[int, _Entry]' = OrderedDict()
+
+    def query(self, doc: NormalizedText, signature: Optional[array] = None) -> Optional[NearDuplicate]:
+        """Document indexé le plus proche au-dessus du seuil, ou None"""
+        signature = signature if signature is not None else minhash_signature(doc.lines)
+        keys = band_keys(signature)
+        placeholders = ', '.join('?' * len(keys))
+        candidates = [row[0] for row in self.connection.execute(
+            f'SELECT document_id FROM buckets WHERE bucket IN ({placeholders}) '
+            'GROUP BY document_id ORDER BY COUNT(*) DESC LIMIT ?', (*keys, MAX_CANDIDATES))]
+
+        best = None
+        for document_id in candidates:
+            entry = self._entry(document_id)
+            if entry is None:
+                continue
+            score = similarity(signature, entry.signature)
+            if score >= self.threshold and (best is None or score > best.similarity):
+                best = NearDuplicate(document_id, score, entry.section_keys, entry.result)
+        return best
+
+    def plan(self, doc: NormalizedText, section_keys: Dict[str, str]) -> ReusePlan:
+        """Sections du quasi-doublon le plus proche que le document peut reprendre sans les extraire
+
+        section_keys : empreinte, par clé du résultat, des lignes que lit l'extracteur de la section.
+        Une section n'est reprise que si son empreinte est identique dans les deux documents.
+        """
+        signature = minhash_signature(doc.lines)
+        match = self.query(doc, signature)
+        if match is None:
+            return ReusePlan(doc, signature, section_keys, {}, 0.0)
+        # Copie de chaque élément : le résultat du document ne partage rien avec l'entrée en cache
+        reused = {key: [copy.copy(item) for item in getattr(match.result, key)]
+                  for key, digest in section_keys.items() if match.section_keys.get(key) == digest}
+        logger.info(f"♻️ Quasi-doublon ({match.similarity:.0%}): {len(reused)} section(s) réutilisée(s)")
+        return ReusePlan(doc, signature, section_keys, reused, match.similarity)
+
+    def add(self, doc: NormalizedText, result: ParsedCV, section_keys: Dict[str, str],
+            signature: Optional[array] = None) -> int:
+        """Indexe un document parsé ; un texte déjà indexé remplace son résultat"""
+        signature = signature if signature is not None else minhash_signature(doc.lines)
+        text_sha256 = hashlib.sha256(doc.text.encode('utf-8')).hexdigest()
+        with self.connection:
+            row = self.connection.execute(
+                'SELECT id FROM documents WHERE text_sha256 = ?', (text_sha256,)).fetchone()
+            if row:
+                document_id = row[0]
+                self.connection.execute('UPDATE documents SET section_keys = ?, result = ? WHERE id = ?',
+                                        (json.dumps(section_keys), _pack(result.to_dict()), document_id))
+            else:
+                document_id = self.connection.execute(
+                    'INSERT INTO documents (text_sha256, signature, section_keys, result, created_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (text_sha256, signature.tobytes(), json.dumps(section_keys), _pack(result.to_dict()), time.time())
+                ).lastrowid
+                self.connection.executemany(
+                    'INSERT INTO buckets (bucket, document_id) VALUES (?, ?)',
+                    [(key, document_id) for key in band_keys(signature)])
+        # Sections seules (sans meta), dans des listes propres au cache
+        cached = ParsedCV(result.personal_info, list(result.experiences), list(result.education),
+                          list(result.skills), list(result.languages), None)
+        self._remember(document_id, _Entry(signature, section_keys, cached))
+        return document_id
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM documents').fetchone()[0]
+
+    def _entry(self, document_id: int) -> Optional[_Entry]:
+        entry = self._cache.get(document_id)
+        if entry is not None:
+            self._cache.move_to_end(document_id)
+            return entry
+        row = self.connection.execute(
+            'SELECT signature, section_keys, result FROM documents WHERE id = ?', (document_id,)).fetchone()
+        if row is None:
+            return None
+        signature = array('Q')
+        signature.frombytes(row[0])
+        entry = _Entry(signature, json.loads(row[1]), ParsedCV.from_dict(_unpack(row[2])))
+        self._remember(document_id, entry)
+        return entry
+
+    def _remember(self, document_id: int, entry: _Entry) -> None:
+        self._cache[document_id] = entry
+        self._cache.move_to_end(document_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - OCR de secours pour les CVs scannés
+Tesseract (sous-processus) sur les seules pages sans couche texte, avec cache par empreinte de page
+
+Le cache contient le texte de CVs de candidats (données personnelles) : dossier privé (0700),
+images supprimées dès que Tesseract les a lues, et textes évincés au-delà d'un âge et d'une
+taille maximum. La limite de Tesseract simultanés est propre au processus : route.ts lance un
+processus par document, elle ne borne donc pas le total sur la machine (à borner côté appelant).
+"""
+
+import os
+import time
+import shutil
+import hashlib
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple
+
+# subprocess, tempfile et concurrent.futures ne sont importés qu'en cas d'OCR effectif
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from parse_budget import ParseBudget
+
+logger = logging.getLogger(__name__)
+
+
+class OcrSettings(NamedTuple):
+    """Réglages de l'OCR de secours"""
+    max_workers: int = 2        # processus Tesseract simultanés (pool dédié)
+    page_budget: int = 5        # pages OCR au plus par document
+    resolution: int = 300       # DPI de rastérisation
+    page_timeout: float = 15.0  # secondes par page
+    language: str = 'fra+eng'
+    cache_dir: str = ''         # vide : <tmp>/cv-genius-ocr-<uid>
+    cache_max_mb: float = 20.0  # taille des textes en cache au-delà de laquelle les plus anciens sont évincés
+    cache_max_age: float = 86400.0  # secondes de conservation d'un texte en cache
+
+
+def settings_from_env(force: bool = False) -> Optional[OcrSettings]:
+    """Réglages lus depuis l'environnement ; None si l'OCR n'est pas demandé ou si Tesseract est absent"""
+    if not (force or os.environ.get('CV_GENIUS_OCR') == '1'):
+        return None
+    if shutil.which('tesseract') is None:
+        logger.warning("⚠️ OCR demandé mais Tesseract est introuvable: OCR désactivé")
+        return None
+    defaults = OcrSettings()
+    return OcrSettings(
+        max_workers=int(os.environ.get('CV_GENIUS_OCR_WORKERS', defaults.max_workers)),
+        page_budget=int(os.environ.get('CV_GENIUS_OCR_PAGE_BUDGET', defaults.page_budget)),
+        resolution=int(os.environ.get('CV_GENIUS_OCR_RESOLUTION', defaults.resolution)),
+        page_timeout=float(os.environ.get('CV_GENIUS_OCR_PAGE_TIMEOUT', defaults.page_timeout)),
+        language=os.environ.get('CV_GENIUS_OCR_LANG', defaults.language),
+        cache_dir=os.environ.get('CV_GENIUS_OCR_CACHE', defaults.cache_dir),
+        cache_max_mb=float(os.environ.get('CV_GENIUS_OCR_CACHE_MB', defaults.cache_max_mb)),
+        cache_max_age=float(os.environ.get('CV_GENIUS_OCR_CACHE_AGE', defaults.cache_max_age)),
+    )
+
+
+# Pool dédié : borne le nombre de Tesseract simultanés du processus. Le parsing attend ses
+# résultats, au plus jusqu'à l'échéance du document (budget)
+_ocr_executor: Optional['ThreadPoolExecutor'] = None
+_ocr_executor_workers = 0
+
+
+def _executor(max_workers: int) -> 'ThreadPoolExecutor':
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _ocr_executor, _ocr_executor_workers
+    if _ocr_executor is None or _ocr_executor_workers != max_workers:
+        if _ocr_executor is not None:
+            _ocr_executor.shutdown(wait=False)
+        _ocr_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='cv-ocr')
+        _ocr_executor_workers = max_workers
+    return _ocr_executor
+
+
+def _cache_dir(settings: OcrSettings) -> Path:
+    """Dossier du cache, lisible par le seul utilisateur courant"""
+    import tempfile
+
+    if settings.cache_dir:
+        cache_dir = Path(settings.cache_dir)
+    else:
+        # Un dossier par utilisateur : /tmp est partagé (le dossier temporaire Windows l'est déjà)
+        name = f'cv-genius-ocr-{os.getuid()}' if hasattr(os, 'getuid') else 'cv-genius-ocr'
+        cache_dir = Path(tempfile.gettempdir()) / name
+    cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # mkdir n'applique pas le mode à un dossier existant (ni sous un umask plus large)
+    os.chmod(cache_dir, 0o700)
+    return cache_dir
+
+
+def evict_cache(cache_dir: Path, settings: OcrSettings) -> None:
+    """Supprime les entrées trop anciennes, puis les plus anciennes au-delà de la taille maximum
+
+    Les images et fichiers temporaires restés d'un processus interrompu sont évincés au même âge.
+    """
+    now = time.time()
+    entries = []
+    for path in cache_dir.iterdir():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime > settings.cache_max_age:
+            path.unlink(missing_ok=True)
+        elif path.suffix == '.txt':
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    max_bytes = settings.cache_max_mb * 1024 * 1024
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def page_hash(page) -> Optional[str]:
+    """Empreinte d'une page pdfplumber : dimensions, flux de contenu et images
+
+    None si les flux ne sont pas lisibles : les dimensions seules sont communes à des scans
+    différents, et le texte OCR d'un candidat serait servi pour le CV d'un autre.
+    """
+    digest = hashlib.sha256(f"{page.width}x{page.height}".encode())
+    hashed = False
+    try:
+        contents = page.page_obj.contents or []
+        for stream in contents:
+            stream = stream.resolve() if hasattr(stream, 'resolve') else stream
+            data = stream.get_data()
+            if data:
+                digest.update(data)
+                hashed = True
+        for image in page.images:
+            stream = image.get('stream')
+            data = stream.get_rawdata() if stream is not None else None
+            if data:
+                digest.update(data)
+                hashed = True
+    except Exception as e:
+        logger.debug(f"Empreinte de page illisible: {e}")
+        return None
+    return digest.hexdigest() if hashed else None
+
+
+def _rasterize(page, cache_dir: Path, settings: OcrSettings) -> str:
+    """Rastérise la page et renvoie l'empreinte de l'image, qui devient sa clé de cache"""
+    import tempfile
+
+    fd, temp_path = tempfile.mkstemp(suffix='.png', dir=str(cache_dir))
+    os.close(fd)
+    try:
+        page.to_image(resolution=settings.resolution).save(temp_path, format='PNG')
+        digest = hashlib.sha256(Path(temp_path).read_bytes()).hexdigest()
+        os.replace(temp_path, cache_dir / f"{digest}.png")
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    return digest
+
+
+def _run_tesseract(image_path: Path, settings: OcrSettings, timeout: float) -> str:
+    """Lance Tesseract sur une image (un seul thread OpenMP pour ne pas saturer la machine)"""
+    import subprocess
+
+    completed = subprocess.run(
+        ['tesseract', str(image_path), 'stdout', '-l', settings.language],
+        capture_output=True,
+        timeout=timeout,
+        env={**os.environ, 'OMP_THREAD_LIMIT': '1'},
+        check=True,
+    )
+    return completed.stdout.decode('utf-8', errors='replace').strip()
+
+
+def ocr_pages(pages: List[Tuple[int, Any]], settings: OcrSettings,
+              budget: Optional['ParseBudget'] = None) -> Tuple[Dict[int, str], List[Dict[str, Any]]]:
+    """OCR des pages sans texte (numéro, page pdfplumber), dans la limite du budget de pages
+
+    Avec un budget de temps, aucune page n'est lancée après l'échéance du document, et les pages
+    en cours sont abandonnées (texte vide, non mis en cache) lorsqu'elle est atteinte.
+    Retourne le texte par numéro de page et, pour chaque page traitée, sa durée et l'usage du cache.
+    """
+    import subprocess
+    from concurrent.futures import TimeoutError as FutureTimeout
+
+    cache_dir = _cache_dir(settings)
+
+    if len(pages) > settings.page_budget:
+        logger.warning(f"⚠️ {len(pages)} pages scannées, OCR limité à {settings.page_budget}")
+    pages = pages[:settings.page_budget]
+
+    texts: Dict[int, str] = {}
+    stats: List[Dict[str, Any]] = []
+    jobs = []
+    submitted = {}  # empreinte -> OCR en cours : une page répétée partage l'image et le résultat
+    for page_number, page in pages:
+        if budget is not None and budget.exhausted('ocr'):
+            break
+        started = time.monotonic()
+        # Sans empreinte fiable des flux, la clé est celle de l'image rastérisée
+        key = page_hash(page) or _rasterize(page, cache_dir, settings)
+        text_path = cache_dir / f"{key}.txt"
+        if text_path.exists():
+            texts[page_number] = text_path.read_text(encoding='utf-8')
+            # Date d'accès : l'éviction retire d'abord les textes les moins récemment utilisés
+            os.utime(text_path)
+            stats.append({'page': page_number, 'seconds': round(time.monotonic() - started, 3), 'cached': True})
+            continue
+
+        # La rastérisation reste dans ce thread : pdfplumber n'est pas thread-safe
+        image_path = cache_dir / f"{key}.png"
+        future = submitted.get(key)
+        if future is None:
+            if not image_path.exists():
+                page.to_image(resolution=settings.resolution).save(str(image_path), format='PNG')
+            remaining = budget.remaining() if budget is not None else None
+            timeout = settings.page_timeout if remaining is None else min(settings.page_timeout, remaining)
+            future = submitted[key] = _executor(settings.max_workers).submit(
+                _run_tesseract, image_path, settings, timeout)
+        jobs.append((page_number, image_path, text_path, started, future))
+
+    for page_number, image_path, text_path, started, future in jobs:
+        try:
+            text = future.result(timeout=budget.remaining() if budget is not None else None)
+        except FutureTimeout:
+            # Échéance du document atteinte : la page est abandonnée, Tesseract s'arrête à son propre timeout
+            future.cancel()
+            # Image supprimée dès que Tesseract ne la lit plus (aussitôt si la page n'a pas démarré)
+            future.add_done_callback(lambda _, image_path=image_path: image_path.unlink(missing_ok=True))
+            budget.exhausted('ocr')
+            logger.warning(f"⏱️ OCR de la page {page_number} abandonné: budget de temps épuisé")
+            text = ""
+        except (subprocess.SubprocessError, OSError) as e:
+            logger.error(f"❌ OCR échoué pour la page {page_number}: {e}")
+            text = ""
+        else:
+            try:
+                text_path.write_text(text, encoding='utf-8')
+            except OSError as e:
+                logger.warning(f"⚠️ Cache OCR non écrit: {e}")
+        finally:
+            # Seul le texte est mis en cache : l'image de la page n'est gardée que le temps de l'OCR
+            if future.done():
+                image_path.unlink(missing_ok=True)
+        texts[page_number] = text
+        stats.append({'page': page_number, 'seconds': round(time.monotonic() - started, 3), 'cached': False})
+        logger.info(f"🔎 Page {page_number} OCR: {len(text)} caractères")
+
+    try:
+        evict_cache(cache_dir, settings)
+    except OSError as e:
+        logger.warning(f"⚠️ Éviction du cache OCR impossible: {e}")
+
+    stats.sort(key=lambda stat: stat['page'])
+    return texts, stats
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Budget de temps par document
+Les extracteurs s'arrêtent proprement une fois le budget épuisé et le résultat est marqué partiel
+"""
+
+import time
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sous le PYTHON_TIMEOUT de 30 s de app/api/parser/route.ts, pour toujours renvoyer un résultat
+DEFAULT_TIME_BUDGET = 20.0
+
+
+class ParseBudget:
+    """Échéance de parsing d'un document (None ou 0 : pas de limite)"""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self._deadline = time.monotonic() + seconds if seconds else None
+        self.truncated_sections: List[str] = []
+
+    def exhausted(self, section: str) -> bool:
+        """Indique si le budget est épuisé, et note la section laissée incomplète"""
+        if self._deadline is None or time.monotonic() < self._deadline:
+            return False
+        if section not in self.truncated_sections:
+            self.truncated_sections.append(section)
+            logger.warning(f"⏱️ Budget de {self.seconds}s épuisé: section '{section}' incomplète")
+        return True
+
+    def remaining(self) -> Optional[float]:
+        """Secondes restantes avant l'échéance (None : pas de limite)"""
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.truncated_sections)
+
+    def meta(self) -> Dict[str, Any]:
+        """Métadonnées ajoutées au résultat lorsqu'il est partiel"""
+        return {
+            "partial": True,
+            "truncatedSections": list(self.truncated_sections),
+            "timeBudget": self.seconds,
+        }
@@ -10,25 +10,21 @@ import json
 import sys
 import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Union
 import logging
 
-# Imports pour le parsing PDF
-try:
-    import pdfplumber
-except ImportError:
-    print("❌ pdfplumber non installé. Installation en cours...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pdfplumber"])
-    import pdfplumber
+from cv_patterns import (
+    EMAIL_PATTERN, PHONE_FR_PATTERN, PHONE_INTERNATIONAL_PATTERN, PHONE_SIMPLE_PATTERN,
+    LINKEDIN_PATTERN, WEBSITE_PATTERN, LOCATION_CITY_PATTERN, WORD_PATTERN,
+)
+from ocr_fallback import OcrSettings, settings_from_env
+from parse_budget import DEFAULT_TIME_BUDGET, ParseBudget
+from pdf_reader import PdfBackendUnavailable, PdfContent, classify_links, metadata_author, metadata_links, read_pdf
+from slow_parse_profiler import profiled_parse, settings_from_env as profiler_settings_from_env
+from text_normalizer import NormalizedText, as_document, classify_header, header_region
 
-try:
-    import spacy
-    # Tenter de charger le modèle français
-    nlp = spacy.load("fr_core_news_sm")
-except (ImportError, OSError):
-    print("⚠️  spaCy ou modèle français non disponible. Utilisation des regex seulement.")
-    nlp = None
+# pdfplumber est importé à la demande par pdf_reader, à la première ouverture d'un PDF.
+# Aucun extracteur n'utilise spaCy : le modèle n'est plus chargé.
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -37,92 +33,133 @@ logger = logging.getLogger(__name__)
 class CVParser:
     """Parser avancé pour CVs PDF"""
     
-    def __init__(self):
-        self.email_pattern = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+    def __init__(self, time_budget: Optional[float] = DEFAULT_TIME_BUDGET, ocr: Optional[OcrSettings] = None):
+        # Patterns en temps linéaire (voir cv_patterns.py)
+        self.email_pattern = EMAIL_PATTERN
         self.phone_patterns = [
-            re.compile(r'(?:\+33|0)\s?[1-9](?:[\s.-]?\d{2}){4}'),  # Français
-            re.compile(r'\+?(?:\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'),  # International
-            re.compile(r'(?:\+\d{1,3}\s?)?\d{10,}'),  # Format simple
+            PHONE_FR_PATTERN,  # Français
+            PHONE_INTERNATIONAL_PATTERN,  # International
+            PHONE_SIMPLE_PATTERN,  # Format simple
         ]
-        self.linkedin_pattern = re.compile(r'(?:https?://)?(?:www\.)?linkedin\.com/in/[\w-]+/?', re.IGNORECASE)
-        self.website_pattern = re.compile(r'(?:https?://)?(?:www\.)?[\w-]+\.[\w]{2,}(?:/[\w-]*)*/?', re.IGNORECASE)
+        self.linkedin_pattern = LINKEDIN_PATTERN
+        self.website_pattern = WEBSITE_PATTERN
+        
+        # Budget de temps par document (secondes, None ou 0 : illimité)
+        self.time_budget = time_budget
+        self._budget = ParseBudget()
+        # OCR de secours des pages scannées (None : désactivé)
+        self.ocr = ocr
         
         # Patterns pour les dates
+        months = r'(?:janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)'
         self.date_patterns = [
+            # Plage commençant par un mois (« Septembre 2019 - Présent ») : plus informative que le
+            # mois seul ou que la plage d'années qu'elle contient, elle est essayée en premier
+            re.compile(rf'({months}\s+\d{{4}})\s*[-–]\s*({months}\s+\d{{4}}|\d{{4}}|présent|aujourd\'hui|actuel|current)', re.IGNORECASE),
             re.compile(r'(\d{4})\s*[-–]\s*(\d{4}|présent|aujourd\'hui|actuel|current)', re.IGNORECASE),
             re.compile(r'(\d{1,2})/(\d{4})\s*[-–]\s*(\d{1,2})/(\d{4})', re.IGNORECASE),
             re.compile(r'(janvier|février|mars|avril|mai|juin|juillet|août|septembre|octobre|novembre|décembre)\s+(\d{4})', re.IGNORECASE),
+            # Année seule (mission d'un an), en dernier recours
+            re.compile(r'\b((?:19|20)\d{2})\b'),
         ]
-        
-        # Mots-clés pour identifier les sections (avec gestion des accents)
-        self.section_keywords = {
-            'experience': ['expérience', 'experience', 'expe.*rience', 'professionnel', 'emploi', 'poste', 'carrière', 'work', 'employment', 'projets'],
-            'education': ['formation', 'éducation', 'education', 'diplôme', 'université', 'école', 'studies', 'degree'],
-            'skills': ['compétences', 'compé.*tences', 'skills', 'technique', 'technical', 'outils', 'tools', 'technologies', 'langages', 'frameworks'],
-            'languages': ['langues', 'languages', 'langue', 'idiomas']
-        }
+        # Scanner combiné : une alternative nommée par pattern de date, dans l'ordre de priorité.
+        # Les groupes de chaque alternative sont mémorisés pour reconstituer match.groups().
+        self.date_scanner = re.compile(
+            '|'.join(f'(?P<date{i}>{pattern.pattern})' for i, pattern in enumerate(self.date_patterns)),
+            re.IGNORECASE
+        )
+        self._date_group_slices = {}
+        group_index = 1
+        for i, pattern in enumerate(self.date_patterns):
+            # +1 pour le groupe nommé qui englobe l'alternative
+            self._date_group_slices[f'date{i}'] = (group_index + 1, group_index + 1 + pattern.groups)
+            group_index += 1 + pattern.groups
+        self.date_block_margin = 200
 
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extrait le texte d'un PDF avec pdfplumber"""
-        try:
-            logger.info(f"📄 Extraction du texte de: {pdf_path}")
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                
-                logger.info(f"✅ Texte extrait: {len(text)} caractères")
-                return text.strip()
-        except Exception as e:
-            logger.error(f"❌ Erreur lors de l'extraction du PDF: {e}")
-            return ""
+        return self.read_pdf(pdf_path).text
+
+    def read_pdf(self, pdf_path: str) -> PdfContent:
+        """Lit le texte, les liens cliquables et les métadonnées du PDF, dans le budget du document"""
+        return read_pdf(pdf_path, ocr=self.ocr, budget=self._budget)
+
+    def normalize(self, text: str) -> NormalizedText:
+        """Normalise le texte extrait une seule fois (réparation Unicode, bullets, espaces)"""
+        return NormalizedText(text)
 
     def clean_text(self, text: str) -> str:
-        """Nettoie le texte extrait"""
-        # Supprime les caractères spéciaux inutiles
-        text = re.sub(r'\s+', ' ', text)  # Espaces multiples
-        text = re.sub(r'[•◦▪▫➤‣⁃]', '-', text)  # Bullets
-        text = text.replace('\n', ' ')
-        return text.strip()
+        """Nettoie le texte extrait en conservant les retours à la ligne"""
+        return self.normalize(text).text
 
-    def extract_personal_info(self, text: str) -> Dict[str, str]:
+    def extract_personal_info(self, text: Union[str, NormalizedText],
+                              pdf_content: Optional[PdfContent] = None) -> Dict[str, str]:
         """Extrait les informations personnelles"""
         logger.info("🔍 Extraction des informations personnelles...")
         personal_info = {}
+        if self._budget.exhausted('personalInfo'):
+            return personal_info
+        
+        # Les patterns de contact s'appliquent à la vue à plat
+        doc = as_document(text)
+        text = doc.flat
+        # Les liens cliquables du PDF sont exacts et passent avant les regex
+        pdf_links = classify_links(pdf_content.links if pdf_content else [])
+        # Les URLs ne sont cherchées dans le texte que dans l'en-tête du CV
+        header_text = ' '.join(header_region(doc.lines))
+        # Les URLs des métadonnées ne servent qu'en dernier recours
+        metadata_urls = classify_links(metadata_links(pdf_content.metadata) if pdf_content else [])
         
         # Email
-        email_match = self.email_pattern.search(text)
-        if email_match:
-            personal_info['email'] = email_match.group()
+        if pdf_links['email']:
+            personal_info['email'] = pdf_links['email'][0]
+        else:
+            email_match = self.email_pattern.search(text)
+            if email_match:
+                personal_info['email'] = email_match.group()
+        if 'email' in personal_info:
             logger.info(f"📧 Email trouvé: {personal_info['email']}")
         
         # Téléphone
-        for pattern in self.phone_patterns:
-            phone_match = pattern.search(text)
-            if phone_match:
-                personal_info['phone'] = phone_match.group().strip()
-                logger.info(f"📱 Téléphone trouvé: {personal_info['phone']}")
-                break
+        if pdf_links['phone']:
+            personal_info['phone'] = pdf_links['phone'][0]
+        else:
+            for pattern in self.phone_patterns:
+                phone_match = pattern.search(text)
+                if phone_match:
+                    personal_info['phone'] = phone_match.group().strip()
+                    break
+        if 'phone' in personal_info:
+            logger.info(f"📱 Téléphone trouvé: {personal_info['phone']}")
         
         # LinkedIn
-        linkedin_match = self.linkedin_pattern.search(text)
-        if linkedin_match:
-            personal_info['linkedin'] = linkedin_match.group()
+        if pdf_links['linkedin']:
+            personal_info['linkedin'] = pdf_links['linkedin'][0]
+        else:
+            linkedin_match = self.linkedin_pattern.search(header_text)
+            if linkedin_match:
+                personal_info['linkedin'] = linkedin_match.group()
+            elif metadata_urls['linkedin']:
+                personal_info['linkedin'] = metadata_urls['linkedin'][0]
+        if 'linkedin' in personal_info:
             logger.info(f"💼 LinkedIn trouvé: {personal_info['linkedin']}")
         
-        # Site web (excluant LinkedIn)
-        website_matches = self.website_pattern.findall(text)
-        for website in website_matches:
-            if 'linkedin' not in website.lower() and 'github' not in website.lower():
-                personal_info['website'] = website
-                logger.info(f"🌐 Site web trouvé: {personal_info['website']}")
-                break
+        # Site web (excluant LinkedIn et GitHub)
+        if pdf_links['web']:
+            personal_info['website'] = pdf_links['web'][0]
+        else:
+            for website_match in self.website_pattern.finditer(header_text):
+                website = website_match.group()
+                if 'linkedin' not in website.lower() and 'github' not in website.lower():
+                    personal_info['website'] = website
+                    break
+            if 'website' not in personal_info and metadata_urls['web']:
+                personal_info['website'] = metadata_urls['web'][0]
+        if 'website' in personal_info:
+            logger.info(f"🌐 Site web trouvé: {personal_info['website']}")
         
         # Nom (première ligne qui ne contient pas email/phone)
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        for line in lines[:5]:  # Cherche dans les 5 premières lignes
+        for line in doc.lines[:5]:  # Cherche dans les 5 premières lignes
             if (len(line) > 2 and len(line) < 50 and 
                 not self.email_pattern.search(line) and 
                 not any(pattern.search(line) for pattern in self.phone_patterns) and
@@ -132,9 +169,16 @@ class CVParser:
                 logger.info(f"👤 Nom trouvé: {personal_info['name']}")
                 break
         
+        # À défaut, l'auteur déclaré dans les métadonnées du PDF
+        if 'name' not in personal_info and pdf_content:
+            author = metadata_author(pdf_content.metadata)
+            if author:
+                personal_info['name'] = author
+                logger.info(f"👤 Nom trouvé (métadonnées): {author}")
+        
         return personal_info
 
-    def extract_experiences(self, text: str) -> List[Dict[str, Any]]:
+    def extract_experiences(self, text: Union[str, NormalizedText]) -> List[Dict[str, Any]]:
         """Extrait les expériences professionnelles"""
         logger.info("🔍 Extraction des expériences...")
         experiences = []
@@ -144,22 +188,13 @@ class CVParser:
         if not experience_section:
             return experiences
         
-        # Cherche les blocs d'expérience avec dates
-        date_blocks = []
-        for pattern in self.date_patterns:
-            matches = pattern.finditer(experience_section)
-            for match in matches:
-                start_pos = max(0, match.start() - 200)
-                end_pos = min(len(experience_section), match.end() + 200)
-                block = experience_section[start_pos:end_pos]
-                date_blocks.append({
-                    'text': block,
-                    'dates': match.groups(),
-                    'position': match.start()
-                })
+        # Cherche les blocs d'expérience avec dates (un seul passage, blocs disjoints)
+        date_blocks = self._find_date_blocks(experience_section)
         
         # Traite chaque bloc d'expérience
         for i, block in enumerate(date_blocks):
+            if self._budget.exhausted('experiences'):
+                break
             exp = {
                 'id': f"exp-{hash(block['text'])}-{i}",
                 'company': self._extract_company(block['text']),
@@ -175,28 +210,72 @@ class CVParser:
         
         return experiences
 
-    def extract_education(self, text: str) -> List[Dict[str, Any]]:
+    def _find_date_blocks(self, section: str) -> List[Dict[str, Any]]:
+        """Découpe une section en blocs disjoints centrés sur chaque date trouvée"""
+        matches = []
+        # Un seul balayage : finditer ne renvoie jamais de correspondances qui se chevauchent
+        for match in self.date_scanner.finditer(section):
+            first, last = self._date_group_slices[match.lastgroup]
+            matches.append((match.start(), match.end(), tuple(match.group(g) for g in range(first, last))))
+        
+        # Les entrées d'une section partagent une mise en forme : les lignes d'en-tête (poste,
+        # entreprise, ville) qui précèdent la première date, titre de section exclu, précèdent aussi
+        # les suivantes. La frontière est placée au début de ces lignes d'en-tête, sans remonter
+        # avant la ligne de la date précédente ; sinon au milieu quand les dates partagent une ligne.
+        header_lines = 0
+        if matches:
+            first_line_start = section.rfind('\n', 0, matches[0][0]) + 1
+            header_lines = max(0, sum(1 for line in section[:first_line_start].split('\n') if line.strip()) - 1)
+        boundaries = []
+        for (_, previous_end, _), (next_start, _, _) in zip(matches, matches[1:]):
+            newline = section.rfind('\n', previous_end, next_start)
+            if newline == -1:
+                boundaries.append((previous_end + next_start) // 2)
+                continue
+            boundary = newline + 1
+            remaining = header_lines
+            while remaining:
+                previous_line = section.rfind('\n', previous_end, boundary - 1)
+                if previous_line == -1:
+                    break
+                if section[previous_line + 1:boundary].strip():
+                    remaining -= 1
+                boundary = previous_line + 1
+            boundaries.append(boundary)
+        
+        # Fenêtres de ±date_block_margin caractères, tronquées aux frontières : aucun recouvrement
+        date_blocks = []
+        for i, (start, end, dates) in enumerate(matches):
+            lower = max(0, start - self.date_block_margin)
+            upper = min(len(section), end + self.date_block_margin)
+            if i > 0:
+                lower = max(lower, boundaries[i - 1])
+            if i < len(boundaries):
+                upper = min(upper, boundaries[i])
+            date_blocks.append({
+                'text': section[lower:upper],
+                'dates': dates,
+                'position': start
+            })
+        
+        return date_blocks
+
+    def extract_education(self, text: Union[str, NormalizedText]) -> List[Dict[str, Any]]:
         """Extrait la formation"""
         logger.info("🔍 Extraction de la formation...")
         education = []
         
-        education_section = self._find_section(text, 'education')
-        if not education_section:
-            return education
-        
         # Patterns pour diplômes
         degree_patterns = [
             r'(master|licence|bac|bachelor|phd|doctorat|ingénieur|bts|dut)[\s\w]*',
             r'(m1|m2|l1|l2|l3)[\s\w]*'
         ]
         
-        lines = education_section.split('\n')
         current_education = {}
         
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        for line in as_document(text).section_lines('education'):
+            if self._budget.exhausted('education'):
+                break
                 
             # Cherche diplôme
             for pattern in degree_patterns:
@@ -223,7 +302,7 @@ class CVParser:
         logger.info(f"🎓 {len(education)} formations trouvées")
         return education
 
-    def extract_skills(self, text: str) -> List[Dict[str, Any]]:
+    def extract_skills(self, text: Union[str, NormalizedText]) -> List[Dict[str, Any]]:
         """Extrait les compétences"""
         logger.info("🔍 Extraction des compétences...")
         skills = []
@@ -239,8 +318,10 @@ class CVParser:
             'html', 'css', 'php', 'ruby', 'go', 'rust', 'typescript'
         ]
         
-        words = re.findall(r'\b\w+\b', skills_section.lower())
+        words = WORD_PATTERN.findall(skills_section.lower())
         for word in words:
+            if self._budget.exhausted('skills'):
+                break
             if word in tech_skills:
                 skills.append({
                     'id': f"skill-{hash(word)}-{len(skills)}",
@@ -252,14 +333,17 @@ class CVParser:
         logger.info(f"🛠️ {len(skills)} compétences trouvées")
         return skills
 
-    def extract_languages(self, text: str) -> List[Dict[str, Any]]:
+    def extract_languages(self, text: Union[str, NormalizedText]) -> List[Dict[str, Any]]:
         """Extrait les langues"""
         logger.info("🔍 Extraction des langues...")
         languages = []
         
         languages_section = self._find_section(text, 'languages')
+        # Sans titre reconnu (coupé par une mise en page sur deux colonnes), seules les entrées
+        # « Langue : niveau » ou « Langue (niveau) » du document sont retenues
+        entry_suffix = '' if languages_section else r'\s*[:(]'
         if not languages_section:
-            return languages
+            languages_section = as_document(text).text
         
         # Langues communes
         common_languages = {
@@ -271,7 +355,9 @@ class CVParser:
         }
         
         for lang, level in common_languages.items():
-            if re.search(r'\b' + lang + r'\b', languages_section, re.IGNORECASE):
+            if self._budget.exhausted('languages'):
+                break
+            if re.search(r'\b' + lang + r'\b' + entry_suffix, languages_section, re.IGNORECASE):
                 languages.append({
                     'id': f"lang-{hash(lang)}-{len(languages)}",
                     'name': lang.title(),
@@ -281,58 +367,10 @@ class CVParser:
         logger.info(f"🗣️ {len(languages)} langues trouvées")
         return languages
 
-    def _find_section(self, text: str, section_type: str) -> str:
-        """Trouve une section spécifique dans le texte"""
-        keywords = self.section_keywords.get(section_type, [])
-        
-        lines = text.split('\n')
-        section_content = ""
-        in_section = False
-        
-        for i, line in enumerate(lines):
-            line_clean = line.strip()
-            if not line_clean:
-                continue
-                
-            # Vérifie si cette ligne est un titre de section
-            for keyword in keywords:
-                if re.search(keyword, line_clean, re.IGNORECASE):
-                    in_section = True
-                    section_content = line_clean + "\n"
-                    
-                    # Collecte les lignes suivantes jusqu'à la prochaine section ou fin
-                    for j in range(i + 1, len(lines)):
-                        next_line = lines[j].strip()
-                        if not next_line:
-                            continue
-                            
-                        # Arrêt si on trouve une nouvelle section (titre en majuscules ou avec des mots-clés spécifiques)
-                        if self._is_new_section_title(next_line):
-                            break
-                            
-                        section_content += next_line + "\n"
-                    
-                    return section_content
-        
-        return ""
+    def _find_section(self, text: Union[str, NormalizedText], section_type: str) -> str:
+        """Trouve une section spécifique dans le texte (titre inclus, jusqu'au titre suivant)"""
+        return as_document(text).section_text(section_type)
     
-    def _is_new_section_title(self, line: str) -> bool:
-        """Détecte si une ligne est un titre de nouvelle section"""
-        line_clean = line.strip().lower()
-        
-        # Liste des titres de sections possibles
-        section_titles = [
-            'formation', 'éducation', 'education', 'expérience', 'experience', 'expe.*rience',
-            'compétences', 'compé.*tences', 'skills', 'langues', 'languages', 'projets',
-            'certifications', 'loisirs', 'centres d\'intérêt', 'références', 'divers'
-        ]
-        
-        for title in section_titles:
-            if re.search(title, line_clean):
-                return True
-                
-        return False
-
     def _extract_company(self, text: str) -> str:
         """Extrait le nom de l'entreprise"""
         # Cherche après des mots-clés comme "chez", "at", etc.
@@ -352,15 +390,15 @@ class CVParser:
         """Extrait l'intitulé du poste"""
         lines = [line.strip() for line in text.split('\n') if line.strip()]
         for line in lines:
-            if len(line) > 5 and len(line) < 100 and not re.search(r'\d{4}', line):
+            # Titres de sections exclus (bloc ouvert au début de la section)
+            if len(line) > 5 and len(line) < 100 and not re.search(r'\d{4}', line) and classify_header(line) is None:
                 return line
         return "Poste"
 
     def _extract_location(self, text: str) -> str:
         """Extrait la localisation"""
         # Cherche des patterns de ville/pays
-        location_pattern = r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*,?\s*[A-Z][a-z]+)'
-        match = re.search(location_pattern, text)
+        match = LOCATION_CITY_PATTERN.search(text)
         return match.group(1) if match else ""
 
     def _extract_description(self, text: str) -> str:
@@ -403,23 +441,37 @@ class CVParser:
         """Parse complet d'un CV PDF"""
         logger.info(f"🚀 Début du parsing de: {pdf_path}")
         
-        # Extraction du texte
-        text = self.extract_text_from_pdf(pdf_path)
-        if not text:
-            logger.error("❌ Impossible d'extraire le texte du PDF")
-            return self._empty_cv_data()
-        
-        # Nettoyage du texte
-        cleaned_text = self.clean_text(text)
-        
-        # Extraction des données structurées
-        result = {
-            "personalInfo": self.extract_personal_info(cleaned_text),
-            "experiences": self.extract_experiences(cleaned_text),
-            "education": self.extract_education(cleaned_text),
-            "skills": self.extract_skills(cleaned_text),
-            "languages": self.extract_languages(cleaned_text)
-        }
+        # Budget de temps démarré avant la lecture : il couvre la lecture du PDF, l'OCR et l'extraction
+        self._budget = ParseBudget(self.time_budget)
+        try:
+            # Extraction du texte, des liens et des métadonnées
+            pdf_content = self.read_pdf(pdf_path)
+            text = pdf_content.text
+            if not text:
+                logger.error("❌ Impossible d'extraire le texte du PDF")
+                return self._empty_cv_data()
+            
+            # Normalisation unique : chaque extracteur utilise la vue dont il a besoin
+            doc = self.normalize(text)
+            
+            # Extraction des données structurées
+            result = {
+                "personalInfo": self.extract_personal_info(doc, pdf_content),
+                "experiences": self.extract_experiences(doc),
+                "education": self.extract_education(doc),
+                "skills": self.extract_skills(doc),
+                "languages": self.extract_languages(doc)
+            }
+            meta = {}
+            if self._budget.partial:
+                meta.update(self._budget.meta())
+                logger.warning("⚠️ Parsing partiel: budget de temps épuisé")
+            if pdf_content.ocr_pages:
+                meta["ocrPages"] = pdf_content.ocr_pages
+            if meta:
+                result["meta"] = meta
+        finally:
+            self._budget = ParseBudget()
         
         logger.info("✅ Parsing terminé avec succès!")
         return result
@@ -440,6 +492,12 @@ def main():
     parser.add_argument('pdf_path', help='Chemin vers le fichier PDF à parser')
     parser.add_argument('--output', '-o', help='Fichier de sortie JSON (optionnel)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Mode verbose')
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET,
+                        help='Budget de temps par document en secondes (0 : illimité)')
+    parser.add_argument('--ocr', action='store_true',
+                        help='OCR (Tesseract) des pages scannées sans texte (aussi via CV_GENIUS_OCR=1)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Capture cProfile/tracemalloc des parsings lents (aussi via CV_GENIUS_PROFILE=1)')
     
     args = parser.parse_args()
     
@@ -452,8 +510,16 @@ def main():
         sys.exit(1)
     
     # Parsing
-    cv_parser = CVParser()
-    result = cv_parser.parse_cv(args.pdf_path)
+    cv_parser = CVParser(time_budget=args.time_budget, ocr=settings_from_env(force=args.ocr))
+    try:
+        profiler = profiler_settings_from_env(force=args.profile)
+        if profiler:
+            result = profiled_parse(cv_parser.parse_cv, args.pdf_path, profiler)
+        else:
+            result = cv_parser.parse_cv(args.pdf_path)
+    except PdfBackendUnavailable as e:
+        logger.error(f"❌ {e}")
+        sys.exit(2)
     
     # Sortie
     json_output = json.dumps(result, indent=2, ensure_ascii=False)
@@ -8,63 +8,194 @@ Version optimisée pour mieux extraire les données structurées des CVs PDF
 import re
 import json
 import sys
+import hashlib
 import argparse
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple, Any
 import logging
 
-# Imports pour le parsing PDF
-try:
-    import pdfplumber
-except ImportError:
-    print("❌ pdfplumber non installé. Installation en cours...")
-    import subprocess
-    subprocess.check_call([sys.executable, "-m", "pip", "install", "pdfplumber"])
-    import pdfplumber
+from cv_models import Education, Experience, Language, ParsedCV, PersonalInfo, Skill
+from cv_patterns import (
+    EMAIL_PATTERN, PHONE_FR_PATTERN, PHONE_INTERNATIONAL_PATTERN,
+    LINKEDIN_SHORT_PATTERN, GITHUB_PATTERN, DEPLOYED_SITE_PATTERN,
+    LOCATION_CAMPUS_PATTERN, LOCATION_COUNTRY_PATTERN, LOCATION_INSA_PATTERN, WORD_PATTERN,
+)
+from ocr_fallback import OcrSettings, settings_from_env
+from parse_budget import DEFAULT_TIME_BUDGET, ParseBudget
+from pdf_reader import PdfBackendUnavailable, PdfContent, classify_links, metadata_author, metadata_links, read_pdf
+from slow_parse_profiler import profiled_parse, settings_from_env as profiler_settings_from_env
+from text_normalizer import NormalizedText, header_region
+
+# pdfplumber est importé à la demande par pdf_reader, à la première ouverture d'un PDF
+# near_duplicates (sqlite3) seulement si un index de quasi-doublons est utilisé
+if TYPE_CHECKING:
+    from near_duplicates import NearDuplicateIndex, ReusePlan
 
 # Configuration du logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Titres et fins de section lus par les extracteurs (ligne nettoyée ; en minuscules pour les compétences).
+# section_keys() s'appuie sur les mêmes patterns pour savoir quelles lignes chaque extracteur lit.
+EXPERIENCE_TITLE = re.compile(r'^EXPÉRIENCES?$', re.IGNORECASE)
+PROJECTS_TITLE = re.compile(r'^PROJETS?\s+PERSONNELS?$', re.IGNORECASE)
+EXPERIENCE_END = re.compile(r'^(FORMATION|COMPÉ?TENCES\s+TECHNIQUES|LANGUES)', re.IGNORECASE)
+EXPERIENCE_LOOKAHEAD = 10  # lignes lues après un intitulé : année, entreprise, description
+EDUCATION_TITLE = re.compile(r'^FORMATION$', re.IGNORECASE)
+EDUCATION_END = re.compile(r'^(PROJETS|COMPÉ?TENCES|EXPÉRIENCES|CERTIFICATS)', re.IGNORECASE)
+EDUCATION_DATES = re.compile(r'\d{4}\s*-\s*(?:\d{4}|présent)', re.IGNORECASE)
+EDUCATION_LOOKAHEAD = 8    # lignes lues après les dates : établissement, diplôme, description
+LANGUAGES_TITLE = re.compile(r'COMPÉ?TENCES\s+LINGUISTIQUES?|LINGUISTIQUES\s+TRANSVERSALES|LANGUES?', re.IGNORECASE)
+LANGUAGES_END = re.compile(r'^(FORMATION|COMPÉ?TENCES\s+TECHNIQUES|EXPÉRIENCES)', re.IGNORECASE)
+SKILLS_TITLE = re.compile(r'compé?tences.{0,40}technique|^langages?\s*:')
+SKILLS_END = re.compile(r'^(formation|langues|expé?rience|certificats)')
+SKILLS_LANGUAGES_LINE = re.compile(r'langages?\s*:')
+
+
+def _experience_reads(lines: List[str]) -> Tuple[Set[int], Dict[int, str]]:
+    """Lignes lues par extract_experiences, et titres qui ouvrent ou ferment la section"""
+    read, markers = set(), {}
+    active = False
+    for i, line in enumerate(lines):
+        if not line:
+            continue
+        if EXPERIENCE_TITLE.search(line) or PROJECTS_TITLE.search(line):
+            active = True
+            markers[i] = 'title'
+        elif EXPERIENCE_END.search(line):
+            active = False
+            markers[i] = 'end'
+        elif active:
+            read.update(range(i, min(i + EXPERIENCE_LOOKAHEAD, len(lines))))
+    return read, markers
+
+
+def _education_reads(lines: List[str]) -> Tuple[Set[int], Dict[int, str]]:
+    """Lignes lues par extract_education, et titres qui ouvrent ou ferment la section"""
+    read, markers = set(), {}
+    active = False
+    for i, line in enumerate(lines):
+        if not line:
+            continue
+        if EDUCATION_TITLE.search(line):
+            active = True
+            markers[i] = 'title'
+            continue
+        if active and EDUCATION_END.search(line):
+            markers[i] = 'end'
+            break
+        if not active:
+            continue
+        read.add(i)
+        if EDUCATION_DATES.search(line):
+            read.update(range(i, min(i + EDUCATION_LOOKAHEAD, len(lines))))
+    return read, markers
+
+
+def _languages_reads(lines: List[str]) -> Tuple[Set[int], Dict[int, str]]:
+    """Lignes lues par extract_languages, et titres qui ouvrent ou ferment la section"""
+    read, markers = set(), {}
+    active = False
+    for i, line in enumerate(lines):
+        if LANGUAGES_TITLE.search(line):
+            active = True
+            markers[i] = 'title'
+            continue
+        if active and LANGUAGES_END.search(line):
+            markers[i] = 'end'
+            break
+        if active and line:
+            read.add(i)
+    return read, markers
+
+
+def _skills_reads(lines: List[str]) -> Tuple[Set[int], Dict[int, str]]:
+    """Lignes lues par extract_skills, et titre qui ferme la section"""
+    read, markers = set(), {}
+    active = False
+    for i, line in enumerate(lines):
+        line = line.lower()
+        if SKILLS_TITLE.search(line):
+            active = True
+        if active and SKILLS_END.search(line):
+            markers[i] = 'end'
+            break
+        if (active or SKILLS_LANGUAGES_LINE.search(line)) and line:
+            read.add(i)
+    return read, markers
+
+
+def _reads_digest(lines: List[str], read: Set[int], markers: Dict[int, str]) -> str:
+    """Empreinte des lignes lues (texte intégral) et des titres (rôle seul), dans l'ordre du document
+
+    Les autres lignes n'influent pas sur l'extracteur : seule leur présence entre deux lignes lues est notée.
+    """
+    digest = hashlib.sha256()
+    gap = False
+    for i, line in enumerate(lines):
+        if i in read:
+            token = 'L' + line
+        elif i in markers:
+            token = 'M' + markers[i]
+        else:
+            gap = True
+            continue
+        if gap:
+            digest.update(b'G\x00')
+            gap = False
+        digest.update(token.encode('utf-8') + b'\x00')
+    return digest.hexdigest()
+
 class ImprovedCVParser:
     """Parser CV amélioré avec détection de sections optimisée"""
     
-    def __init__(self):
-        self.email_pattern = re.compile(r'\b[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\b')
+    def __init__(self, time_budget: Optional[float] = DEFAULT_TIME_BUDGET, ocr: Optional[OcrSettings] = None,
+                 duplicate_index: Optional['NearDuplicateIndex'] = None):
+        # Patterns en temps linéaire (voir cv_patterns.py)
+        self.email_pattern = EMAIL_PATTERN
         self.phone_patterns = [
-            re.compile(r'(?:\+33|0)\s?[1-9](?:[\s.-]?\d{2}){4}'),  # Français
-            re.compile(r'\+?(?:\d{1,3}[\s.-]?)?\(?\d{3}\)?[\s.-]?\d{3}[\s.-]?\d{4}'),  # International
+            PHONE_FR_PATTERN,  # Français
+            PHONE_INTERNATIONAL_PATTERN,  # International
         ]
         # Pattern amélioré pour LinkedIn
-        self.linkedin_pattern = re.compile(r'(?:https?://)?(?:www\.)?(?:linkedin\.com/in/|in/)[\w-]+/?', re.IGNORECASE)
+        self.linkedin_pattern = LINKEDIN_SHORT_PATTERN
         # Pattern pour GitHub
-        self.github_pattern = re.compile(r'(?:https?://)?(?:www\.)?github\.com/[\w-]+/?', re.IGNORECASE)
+        self.github_pattern = GITHUB_PATTERN
         # Pattern pour sites web déployés
-        self.deployed_site_pattern = re.compile(r'https?://[\w.-]+\.(?:vercel\.app|onrender\.com|herokuapp\.com|netlify\.app)[\w/.-]*', re.IGNORECASE)
+        self.deployed_site_pattern = DEPLOYED_SITE_PATTERN
+        # Localisation (dans l'ordre de priorité)
+        self.location_patterns = [LOCATION_CAMPUS_PATTERN, LOCATION_COUNTRY_PATTERN, LOCATION_INSA_PATTERN]
+        
+        # Budget de temps par document (secondes, None ou 0 : illimité)
+        self.time_budget = time_budget
+        self._budget = ParseBudget()
+        # OCR de secours des pages scannées (None : désactivé)
+        self.ocr = ocr
+        # Index des CVs déjà parsés, pour réutiliser les sections inchangées (None : désactivé)
+        self.duplicate_index = duplicate_index
 
     def extract_text_from_pdf(self, pdf_path: str) -> str:
         """Extrait le texte d'un PDF avec pdfplumber"""
-        try:
-            logger.info(f"📄 Extraction du texte de: {pdf_path}")
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                
-                logger.info(f"✅ Texte extrait: {len(text)} caractères")
-                return text.strip()
-        except Exception as e:
-            logger.error(f"❌ Erreur lors de l'extraction du PDF: {e}")
-            return ""
+        return self.read_pdf(pdf_path).text
+
+    def read_pdf(self, pdf_path: str) -> PdfContent:
+        """Lit le texte, les liens cliquables et les métadonnées du PDF, dans le budget du document"""
+        return read_pdf(pdf_path, ocr=self.ocr, budget=self._budget)
 
-    def extract_personal_info(self, text: str) -> Dict[str, str]:
+    def extract_personal_info(self, text: str, pdf_content: Optional[PdfContent] = None) -> PersonalInfo:
         """Extrait les informations personnelles avec amélioration"""
         logger.info("🔍 Extraction des informations personnelles...")
         info = {}
+        if self._budget.exhausted('personalInfo'):
+            return PersonalInfo.from_dict(info)
         
         lines = text.split('\n')
+        # Les liens cliquables du PDF sont exacts et passent avant les regex
+        pdf_links = classify_links(pdf_content.links if pdf_content else [])
+        # Les URLs ne sont cherchées dans le texte que dans l'en-tête du CV
+        header_text = '\n'.join(header_region([line.strip() for line in lines if line.strip()]))
+        # Les URLs des métadonnées ne servent qu'en dernier recours
+        metadata_urls = classify_links(metadata_links(pdf_content.metadata) if pdf_content else [])
         
         # Nom (généralement première ligne)
         if lines:
@@ -72,25 +203,43 @@ class ImprovedCVParser:
             if first_line and not '@' in first_line and not '+' in first_line:
                 info['name'] = first_line
                 logger.info(f"👤 Nom trouvé: {first_line}")
+        if 'name' not in info and pdf_content:
+            author = metadata_author(pdf_content.metadata)
+            if author:
+                info['name'] = author
+                logger.info(f"👤 Nom trouvé (métadonnées): {author}")
         
         # Email
-        email_match = self.email_pattern.search(text)
-        if email_match:
-            info['email'] = email_match.group()
+        if pdf_links['email']:
+            info['email'] = pdf_links['email'][0]
+        else:
+            email_match = self.email_pattern.search(text)
+            if email_match:
+                info['email'] = email_match.group()
+        if 'email' in info:
             logger.info(f"📧 Email trouvé: {info['email']}")
         
         # Téléphone
-        for pattern in self.phone_patterns:
-            phone_match = pattern.search(text)
-            if phone_match:
-                info['phone'] = phone_match.group()
-                logger.info(f"📱 Téléphone trouvé: {info['phone']}")
-                break
+        if pdf_links['phone']:
+            info['phone'] = pdf_links['phone'][0]
+        else:
+            for pattern in self.phone_patterns:
+                phone_match = pattern.search(text)
+                if phone_match:
+                    info['phone'] = phone_match.group()
+                    break
+        if 'phone' in info:
+            logger.info(f"📱 Téléphone trouvé: {info['phone']}")
         
         # LinkedIn amélioré
-        linkedin_match = self.linkedin_pattern.search(text)
-        if linkedin_match:
-            linkedin_url = linkedin_match.group()
+        linkedin_url = pdf_links['linkedin'][0] if pdf_links['linkedin'] else ""
+        if not linkedin_url:
+            linkedin_match = self.linkedin_pattern.search(header_text)
+            if linkedin_match:
+                linkedin_url = linkedin_match.group()
+            elif metadata_urls['linkedin']:
+                linkedin_url = metadata_urls['linkedin'][0]
+        if linkedin_url:
             # Normalise l'URL LinkedIn
             if not linkedin_url.startswith('http'):
                 if linkedin_url.startswith('in/'):
@@ -101,9 +250,14 @@ class ImprovedCVParser:
             logger.info(f"💼 LinkedIn trouvé: {linkedin_url}")
         
         # GitHub
-        github_match = self.github_pattern.search(text)
-        if github_match:
-            github_url = github_match.group()
+        github_url = pdf_links['github'][0] if pdf_links['github'] else ""
+        if not github_url:
+            github_match = self.github_pattern.search(header_text)
+            if github_match:
+                github_url = github_match.group()
+            elif metadata_urls['github']:
+                github_url = metadata_urls['github'][0]
+        if github_url:
             if not github_url.startswith('http'):
                 github_url = 'https://' + github_url
             info['website'] = github_url
@@ -111,28 +265,31 @@ class ImprovedCVParser:
         
         # Sites déployés (projets)
         if 'website' not in info:
-            deployed_match = self.deployed_site_pattern.search(text)
-            if deployed_match:
-                info['website'] = deployed_match.group()
+            deployed_links = [uri for uri in pdf_links['web'] if self.deployed_site_pattern.match(uri)]
+            if deployed_links:
+                info['website'] = deployed_links[0]
+            else:
+                deployed_match = self.deployed_site_pattern.search(header_text)
+                if deployed_match:
+                    info['website'] = deployed_match.group()
+                else:
+                    deployed_links = [uri for uri in metadata_urls['web'] if self.deployed_site_pattern.match(uri)]
+                    if deployed_links:
+                        info['website'] = deployed_links[0]
+            if 'website' in info:
                 logger.info(f"🌐 Site déployé trouvé: {info['website']}")
         
         # Localisation améliorée
-        location_patterns = [
-            r'Campus\s+([A-Z][a-zA-Z\s]+)',
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*),?\s*(?:France|Vietnam)',
-            r'INSA\s+([A-Z][a-z]+)'
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in self.location_patterns:
+            match = pattern.search(text)
             if match:
                 info['location'] = match.group(1).strip()
                 logger.info(f"📍 Localisation trouvée: {info['location']}")
                 break
         
-        return info
+        return PersonalInfo.from_dict(info)
 
-    def extract_experiences(self, text: str) -> List[Dict[str, Any]]:
+    def extract_experiences(self, text: str) -> List[Experience]:
         """Extrait les expériences avec logique améliorée"""
         logger.info("🔍 Extraction des expériences...")
         experiences = []
@@ -142,20 +299,22 @@ class ImprovedCVParser:
         in_projects_section = False
         
         for i, line in enumerate(lines):
+            if self._budget.exhausted('experiences'):
+                break
             line = line.strip()
             if not line:
                 continue
                 
             # Détecte les sections
-            if re.search(r'^EXPÉRIENCES?$', line, re.IGNORECASE):
+            if EXPERIENCE_TITLE.search(line):
                 in_experience_section = True
                 in_projects_section = False
                 continue
-            elif re.search(r'^PROJETS?\s+PERSONNELS?$', line, re.IGNORECASE):
+            elif PROJECTS_TITLE.search(line):
                 in_projects_section = True
                 in_experience_section = False
                 continue
-            elif re.search(r'^(FORMATION|COMPÉ?TENCES\s+TECHNIQUES|LANGUES)', line, re.IGNORECASE):
+            elif EXPERIENCE_END.search(line):
                 in_experience_section = False
                 in_projects_section = False
                 continue
@@ -217,7 +376,7 @@ class ImprovedCVParser:
                 if year_found:
                     # Collecte la description
                     description_parts = []
-                    for j in range(i+2, min(i+10, len(lines))):
+                    for j in range(i+2, min(i+EXPERIENCE_LOOKAHEAD, len(lines))):
                         desc_line = lines[j].strip()
                         if desc_line and not re.search(r'^[A-Z\s]+$', desc_line):
                             if re.search(r'^(FORMATION|COMPÉ?TENCES|CERTIFICATS)', desc_line, re.IGNORECASE):
@@ -225,16 +384,16 @@ class ImprovedCVParser:
                             if desc_line.startswith(('Fonctionnalités', 'Technologies', 'Compétences', 'Déploiement')):
                                 description_parts.append(desc_line)
                     
-                    exp = {
-                        'id': f"exp-{hash(line + company)}-{len(experiences)}",
-                        'position': line,
-                        'company': company or "Projet personnel",
-                        'location': location,
-                        'startDate': year,
-                        'endDate': '',
-                        'description': ' '.join(description_parts),
-                        'isCurrentPosition': False
-                    }
+                    exp = Experience(
+                        id=f"exp-{hash(line + company)}-{len(experiences)}",
+                        position=line,
+                        company=company or "Projet personnel",
+                        location=location,
+                        start_date=year,
+                        end_date='',
+                        description=' '.join(description_parts),
+                        is_current_position=False
+                    )
                     
                     experiences.append(exp)
                     logger.info(f"💼 Expérience trouvée: {line} - {company}")
@@ -242,7 +401,7 @@ class ImprovedCVParser:
         logger.info(f"💼 {len(experiences)} expériences trouvées")
         return experiences
 
-    def extract_education(self, text: str) -> List[Dict[str, Any]]:
+    def extract_education(self, text: str) -> List[Education]:
         """Extrait la formation avec logique améliorée"""
         logger.info("🔍 Extraction de la formation...")
         education = []
@@ -251,24 +410,26 @@ class ImprovedCVParser:
         in_formation_section = False
         
         for i, line in enumerate(lines):
+            if self._budget.exhausted('education'):
+                break
             line = line.strip()
             if not line:
                 continue
                 
             # Détecte le début de la section formation
-            if re.search(r'^FORMATION$', line, re.IGNORECASE):
+            if EDUCATION_TITLE.search(line):
                 in_formation_section = True
                 continue
                 
             # Arrête si on atteint une nouvelle section
-            if in_formation_section and re.search(r'^(PROJETS|COMPÉ?TENCES|EXPÉRIENCES|CERTIFICATS)', line, re.IGNORECASE):
+            if in_formation_section and EDUCATION_END.search(line):
                 break
                 
             if not in_formation_section:
                 continue
                 
             # Cherche une ligne avec des dates
-            if re.search(r'\d{4}\s*-\s*(?:\d{4}|présent)', line, re.IGNORECASE):
+            if EDUCATION_DATES.search(line):
                 # Cette ligne contient les dates
                 date_match = re.search(r'(\d{4})\s*-\s*((?:\d{4}|présent))', line, re.IGNORECASE)
                 if date_match:
@@ -299,22 +460,22 @@ class ImprovedCVParser:
                     
                     # Collecte la description
                     description_parts = []
-                    for j in range(i+2, min(i+8, len(lines))):
+                    for j in range(i+2, min(i+EDUCATION_LOOKAHEAD, len(lines))):
                         desc_line = lines[j].strip()
                         if desc_line and not re.search(r'^[A-Z\s]+:?$', desc_line):
                             if re.search(r'^(PROJETS|COMPÉ?TENCES|EXPÉRIENCES)', desc_line, re.IGNORECASE):
                                 break
                             description_parts.append(desc_line)
                     
-                    edu = {
-                        'id': f"edu-{hash(degree + institution)}-{len(education)}",
-                        'degree': degree or "Formation en cours",
-                        'institution': institution or "INSA Toulouse",
-                        'field': "Informatique",
-                        'startDate': start_year,
-                        'endDate': '' if end_year == 'présent' else end_year,
-                        'description': ' '.join(description_parts[:3])  # Limite à 3 lignes
-                    }
+                    edu = Education(
+                        id=f"edu-{hash(degree + institution)}-{len(education)}",
+                        degree=degree or "Formation en cours",
+                        institution=institution or "INSA Toulouse",
+                        field="Informatique",
+                        start_date=start_year,
+                        end_date='' if end_year == 'présent' else end_year,
+                        description=' '.join(description_parts[:3])  # Limite à 3 lignes
+                    )
                     
                     education.append(edu)
                     logger.info(f"🎓 Formation trouvée: {degree} - {institution}")
@@ -322,7 +483,7 @@ class ImprovedCVParser:
         logger.info(f"🎓 {len(education)} formations trouvées")
         return education
 
-    def extract_languages(self, text: str) -> List[Dict[str, Any]]:
+    def extract_languages(self, text: str) -> List[Language]:
         """Extrait les langues avec reconnaissance améliorée"""
         logger.info("🔍 Extraction des langues...")
         languages = []
@@ -332,24 +493,26 @@ class ImprovedCVParser:
         in_languages_section = False
         
         for line in lines:
+            if self._budget.exhausted('languages'):
+                break
             line_clean = line.strip()
             
             # Détecte le début de la section langues
-            if re.search(r'COMPÉ?TENCES\s+LINGUISTIQUES?|LINGUISTIQUES\s+TRANSVERSALES|LANGUES?', line_clean, re.IGNORECASE):
+            if LANGUAGES_TITLE.search(line_clean):
                 in_languages_section = True
                 continue
                 
             # Arrête si nouvelle section
-            if in_languages_section and re.search(r'^(FORMATION|COMPÉ?TENCES\s+TECHNIQUES|EXPÉRIENCES)', line_clean, re.IGNORECASE):
+            if in_languages_section and LANGUAGES_END.search(line_clean):
                 break
                 
             if in_languages_section and line_clean:
                 # Patterns pour extraire langues avec niveaux
                 lang_patterns = [
-                    (r'(Français?)\s*:\s*([^(]+)(?:\(([^)]+)\))?', 'Français'),
-                    (r'(Anglais?)\s*:\s*([^(]+)(?:\(([^)]+)\))?', 'Anglais'),
-                    (r'(Vietnamien?)\s*:\s*([^(]+)', 'Vietnamien'),
-                    (r'(Espagnol?)\s*:\s*([^(]+)(?:\(([^)]+)\))?', 'Espagnol'),
+                    (r'(Français?)\s*:\s*([^(]{1,80})(?:\(([^)]{1,40})\))?', 'Français'),
+                    (r'(Anglais?)\s*:\s*([^(]{1,80})(?:\(([^)]{1,40})\))?', 'Anglais'),
+                    (r'(Vietnamien?)\s*:\s*([^(]{1,80})', 'Vietnamien'),
+                    (r'(Espagnol?)\s*:\s*([^(]{1,80})(?:\(([^)]{1,40})\))?', 'Espagnol'),
                 ]
                 
                 for pattern, lang_name in lang_patterns:
@@ -373,17 +536,17 @@ class ImprovedCVParser:
                         else:
                             level = 'B1'
                         
-                        languages.append({
-                            'id': f"lang-{hash(lang_name)}-{len(languages)}",
-                            'name': lang_name,
-                            'level': level
-                        })
+                        languages.append(Language(
+                            id=f"lang-{hash(lang_name)}-{len(languages)}",
+                            name=lang_name,
+                            level=level
+                        ))
                         logger.info(f"🗣️ Langue trouvée: {lang_name} ({level})")
         
         logger.info(f"🗣️ {len(languages)} langues trouvées")
         return languages
 
-    def extract_skills(self, text: str) -> List[Dict[str, Any]]:
+    def extract_skills(self, text: str) -> List[Skill]:
         """Extrait les compétences techniques"""
         logger.info("🔍 Extraction des compétences...")
         skills = []
@@ -401,64 +564,119 @@ class ImprovedCVParser:
         }
         
         for line in lines:
+            if self._budget.exhausted('skills'):
+                break
             line_clean = line.strip().lower()
             
             # Détecte le début de la section compétences
-            if re.search(r'compé?tences.*technique', line_clean) or re.search(r'^langages?\s*:', line_clean):
+            if SKILLS_TITLE.search(line_clean):
                 in_skills_section = True
                 
             # Arrête si nouvelle section
-            if in_skills_section and re.search(r'^(formation|langues|expé?rience|certificats)', line_clean):
+            if in_skills_section and SKILLS_END.search(line_clean):
                 break
                 
-            if (in_skills_section or re.search(r'langages?\s*:', line_clean)) and line_clean:
+            if (in_skills_section or SKILLS_LANGUAGES_LINE.search(line_clean)) and line_clean:
                 # Extrait les technologies de la ligne
-                words = re.findall(r'\b\w+\b', line_clean)
+                words = WORD_PATTERN.findall(line_clean)
                 for word in words:
                     if word in tech_keywords:
                         # Évite les doublons
-                        if not any(skill['name'].lower() == word for skill in skills):
-                            skills.append({
-                                'id': f"skill-{hash(word)}-{len(skills)}",
-                                'name': word.title(),
-                                'category': 'technical',
-                                'level': 'intermediate'
-                            })
+                        if not any(skill.name.lower() == word for skill in skills):
+                            skills.append(Skill(
+                                id=f"skill-{hash(word)}-{len(skills)}",
+                                name=word.title(),
+                                category='technical',
+                                level='intermediate'
+                            ))
         
         logger.info(f"🛠️ {len(skills)} compétences trouvées")
         return skills
 
+    def section_keys(self, text: str) -> Dict[str, str]:
+        """Empreinte, par clé du résultat, des lignes dont dépend chaque extracteur de section
+
+        Deux textes de même empreinte pour une section donnent la même section extraite : un
+        quasi-doublon peut la reprendre. Les fenêtres de lecture suivent les extracteurs, qui lisent
+        au-delà des titres du lexique (bloc CONTACT intercalé dans FORMATION, colonnes entremêlées).
+        """
+        lines = [line.strip() for line in text.split('\n')]
+        return {
+            'experiences': _reads_digest(lines, *_experience_reads(lines)),
+            'education': _reads_digest(lines, *_education_reads(lines)),
+            'skills': _reads_digest(lines, *_skills_reads(lines)),
+            'languages': _reads_digest(lines, *_languages_reads(lines)),
+        }
+
     def parse_cv(self, pdf_path: str) -> Dict[str, Any]:
-        """Parse complet d'un CV PDF"""
+        """Parse complet d'un CV PDF, au format JSON du parser (voir parse_cv_model)"""
+        return self.parse_cv_model(pdf_path).to_dict()
+
+    def parse_cv_model(self, pdf_path: str) -> ParsedCV:
+        """Parse complet d'un CV PDF, en modèle typé (compact pour garder de nombreux CVs en mémoire)"""
         logger.info(f"🚀 Début du parsing de: {pdf_path}")
         
-        # Extraction du texte
-        text = self.extract_text_from_pdf(pdf_path)
-        if not text:
-            logger.error("❌ Impossible d'extraire le texte du PDF")
-            return self._empty_cv_data()
-        
-        # Extraction des données structurées
-        result = {
-            "personalInfo": self.extract_personal_info(text),
-            "experiences": self.extract_experiences(text),
-            "education": self.extract_education(text),
-            "skills": self.extract_skills(text),
-            "languages": self.extract_languages(text)
-        }
+        # Budget de temps démarré avant la lecture : il couvre la lecture du PDF, l'OCR et l'extraction
+        self._budget = ParseBudget(self.time_budget)
+        try:
+            # Extraction du texte, des liens et des métadonnées
+            pdf_content = self.read_pdf(pdf_path)
+            text = pdf_content.text
+            if not text:
+                logger.error("❌ Impossible d'extraire le texte du PDF")
+                return ParsedCV.empty()
+            
+            # Quasi-doublon d'un CV déjà parsé : ses sections inchangées sont reprises telles quelles
+            plan = self._plan_reuse(text) if self.duplicate_index is not None else None
+            reused = plan.reused if plan else {}
+            
+            # Les informations personnelles dépendent aussi des liens du PDF : toujours recalculées
+            personal_info = self.extract_personal_info(text, pdf_content)
+            sections = {}
+            for key, extractor in (("experiences", self.extract_experiences),
+                                   ("education", self.extract_education),
+                                   ("skills", self.extract_skills),
+                                   ("languages", self.extract_languages)):
+                if key in reused:
+                    sections[key] = reused[key]
+                else:
+                    sections[key] = extractor(text)
+            result = ParsedCV(personal_info, sections["experiences"],
+                              sections["education"], sections["skills"], sections["languages"], None)
+            
+            if plan and not self._budget.partial:
+                self._index_result(plan, result)
+            
+            meta = {}
+            if self._budget.partial:
+                meta.update(self._budget.meta())
+                logger.warning("⚠️ Parsing partiel: budget de temps épuisé")
+            if pdf_content.ocr_pages:
+                meta["ocrPages"] = pdf_content.ocr_pages
+            if reused:
+                meta["nearDuplicate"] = {"similarity": round(plan.similarity, 3),
+                                         "reusedSections": list(reused)}
+            result.meta = meta or None
+        finally:
+            self._budget = ParseBudget()
         
         logger.info("✅ Parsing terminé avec succès!")
         return result
 
-    def _empty_cv_data(self) -> Dict[str, Any]:
-        """Retourne une structure CV vide"""
-        return {
-            "personalInfo": {},
-            "experiences": [],
-            "education": [],
-            "skills": [],
-            "languages": []
-        }
+    def _plan_reuse(self, text: str) -> Optional['ReusePlan']:
+        """Cherche un quasi-doublon dans l'index ; une erreur d'index n'interrompt pas le parsing"""
+        try:
+            return self.duplicate_index.plan(NormalizedText(text), self.section_keys(text))
+        except Exception as e:
+            logger.warning(f"⚠️ Index des quasi-doublons indisponible: {e}")
+            return None
+
+    def _index_result(self, plan: 'ReusePlan', result: ParsedCV) -> None:
+        """Ajoute un résultat complet à l'index"""
+        try:
+            self.duplicate_index.add(plan.doc, result, plan.section_keys, plan.signature)
+        except Exception as e:
+            logger.warning(f"⚠️ Résultat non indexé: {e}")
 
 def main():
     """Fonction principale pour utilisation en ligne de commande"""
@@ -466,6 +684,14 @@ def main():
     parser.add_argument('pdf_path', help='Chemin vers le fichier PDF à parser')
     parser.add_argument('--output', '-o', help='Fichier de sortie JSON (optionnel)')
     parser.add_argument('--verbose', '-v', action='store_true', help='Mode verbose')
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET,
+                        help='Budget de temps par document en secondes (0 : illimité)')
+    parser.add_argument('--ocr', action='store_true',
+                        help='OCR (Tesseract) des pages scannées sans texte (aussi via CV_GENIUS_OCR=1)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Capture cProfile/tracemalloc des parsings lents (aussi via CV_GENIUS_PROFILE=1)')
+    parser.add_argument('--dedup-index',
+                        help='Base SQLite des CVs déjà parsés : les quasi-doublons réutilisent les sections inchangées')
     
     args = parser.parse_args()
     
@@ -478,8 +704,24 @@ def main():
         sys.exit(1)
     
     # Parsing
-    cv_parser = ImprovedCVParser()
-    result = cv_parser.parse_cv(args.pdf_path)
+    duplicate_index = None
+    if args.dedup_index:
+        from near_duplicates import NearDuplicateIndex
+        duplicate_index = NearDuplicateIndex(Path(args.dedup_index))
+    cv_parser = ImprovedCVParser(time_budget=args.time_budget, ocr=settings_from_env(force=args.ocr),
+                                 duplicate_index=duplicate_index)
+    try:
+        profiler = profiler_settings_from_env(force=args.profile)
+        if profiler:
+            result = profiled_parse(cv_parser.parse_cv, args.pdf_path, profiler)
+        else:
+            result = cv_parser.parse_cv(args.pdf_path)
+    except PdfBackendUnavailable as e:
+        logger.error(f"❌ {e}")
+        sys.exit(2)
+    finally:
+        if duplicate_index is not None:
+            duplicate_index.close()
     
     # Sortie
     json_output = json.dumps(result, indent=2, ensure_ascii=False)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Lecture PDF
+Texte, liens cliquables et métadonnées d'un PDF, lus en une seule ouverture du fichier
+"""
+
+import logging
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional
+
+from cv_patterns import LINKEDIN_PATTERN, WEBSITE_PATTERN
+from ocr_fallback import OcrSettings, ocr_pages
+
+if TYPE_CHECKING:
+    from parse_budget import ParseBudget
+
+logger = logging.getLogger(__name__)
+
+
+class PdfContent(NamedTuple):
+    """Contenu brut d'un PDF"""
+    text: str
+    links: List[str]
+    metadata: Dict[str, Any]
+    ocr_pages: List[Dict[str, Any]]  # pages passées à l'OCR : numéro, durée, cache
+
+
+EMPTY_PDF_CONTENT = PdfContent("", [], {}, [])
+
+
+class PdfBackendUnavailable(RuntimeError):
+    """pdfplumber n'est pas installé : le parsing échoue immédiatement, sans installation à la volée"""
+
+
+def load_pdfplumber():
+    """Importe pdfplumber à la première ouverture d'un PDF (démarrage rapide pour --help)"""
+    try:
+        import pdfplumber
+    except ImportError as e:
+        raise PdfBackendUnavailable(
+            "pdfplumber n'est pas installé. Lancez ./scripts/install-python-deps.sh "
+            "ou pip install -r scripts/requirements.txt"
+        ) from e
+    return pdfplumber
+
+
+def read_pdf(pdf_path: str, ocr: Optional[OcrSettings] = None, budget: Optional['ParseBudget'] = None) -> PdfContent:
+    """Extrait le texte, les URI des annotations de lien et les métadonnées d'un PDF
+
+    Avec des réglages OCR, les pages sans couche texte sont passées à Tesseract. Avec un budget,
+    ni la lecture des pages ni l'OCR ne dépassent l'échéance du document.
+    """
+    pdfplumber = load_pdfplumber()
+
+    try:
+        logger.info(f"📄 Extraction du texte de: {pdf_path}")
+        with pdfplumber.open(pdf_path) as pdf:
+            page_texts = []
+            scanned_pages = []
+            links = []
+            for page_number, page in enumerate(pdf.pages, start=1):
+                if budget is not None and budget.exhausted('pdf'):
+                    break
+                page_text = page.extract_text()
+                page_texts.append(page_text or "")
+                if ocr and not (page_text or "").strip():
+                    scanned_pages.append((page_number, page))
+                for hyperlink in page.hyperlinks:
+                    uri = hyperlink.get('uri')
+                    if isinstance(uri, str) and uri.strip() and uri.strip() not in links:
+                        links.append(uri.strip())
+            metadata = {key: value for key, value in (pdf.metadata or {}).items() if isinstance(value, str)}
+
+            ocr_stats = []
+            if scanned_pages:
+                logger.info(f"🔎 {len(scanned_pages)} page(s) sans texte: OCR de secours")
+                ocr_texts, ocr_stats = ocr_pages(scanned_pages, ocr, budget)
+                for page_number, page_text in ocr_texts.items():
+                    page_texts[page_number - 1] = page_text
+
+            text = "".join(page_text + "\n" for page_text in page_texts if page_text)
+            logger.info(f"✅ Texte extrait: {len(text)} caractères, {len(links)} liens")
+            return PdfContent(text.strip(), links, metadata, ocr_stats)
+    except Exception as e:
+        logger.error(f"❌ Erreur lors de l'extraction du PDF: {e}")
+        return EMPTY_PDF_CONTENT
+
+
+# Champs de métadonnées renseignés par l'auteur ; Producer et Creator nomment l'outil (www.ilovepdf.com...)
+METADATA_LINK_FIELDS = ('Subject', 'Keywords', 'Title')
+
+
+def metadata_links(metadata: Dict[str, Any]) -> List[str]:
+    """URLs citées dans les métadonnées du document (Subject, Keywords, Title)
+
+    Moins sûres que les annotations et que l'en-tête du CV : les parsers ne s'en servent qu'en dernier recours.
+    """
+    links = []
+    for field in METADATA_LINK_FIELDS:
+        value = metadata.get(field)
+        if not isinstance(value, str):
+            continue
+        for pattern in (LINKEDIN_PATTERN, WEBSITE_PATTERN):
+            links.extend(match.group() for match in pattern.finditer(value))
+    return links
+
+
+def classify_links(links: List[str]) -> Dict[str, List[str]]:
+    """Range les URI par type : email (mailto:), phone (tel:), linkedin, github, web"""
+    classified = {'email': [], 'phone': [], 'linkedin': [], 'github': [], 'web': []}
+    for uri in links:
+        lower = uri.lower()
+        if lower.startswith('mailto:'):
+            classified['email'].append(uri[len('mailto:'):].split('?')[0])
+        elif lower.startswith('tel:'):
+            classified['phone'].append(uri[len('tel:'):])
+        elif 'linkedin.com/' in lower:
+            classified['linkedin'].append(uri)
+        elif 'github.com/' in lower:
+            classified['github'].append(uri)
+        elif lower.startswith(('http://', 'https://', 'www.')):
+            classified['web'].append(uri)
+    return classified
+
+
+def metadata_author(metadata: Dict[str, Any]) -> str:
+    """Auteur du document s'il ressemble à un nom complet (au moins prénom + nom, sans chiffres)"""
+    author = str(metadata.get('Author', '')).strip()
+    if 2 < len(author) < 50 and ' ' in author and not any(char.isdigit() for char in author):
+        return author
+    return ""
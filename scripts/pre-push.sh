@@ -148,6 +148,16 @@ except ImportError as e:
         fi
     fi
     
+    # Run the Python parser unit tests
+    if [ -d "tests/python" ]; then
+        if python -m unittest discover -s tests/python > /dev/null 2>&1; then
+            print_success "Python parser tests passed"
+        else
+            print_error "Python parser tests failed"
+            exit 1
+        fi
+    fi
+    
     print_success "Python environment validated"
 else
     print_warning "Python requirements.txt not found, skipping Python tests..."
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Capture des parsings lents
+Profil cProfile et instantané tracemalloc enregistrés localement quand un document dépasse
+un seuil de durée ou de mémoire, pour reproduire hors ligne les points chauds de production
+"""
+
+import os
+import json
+import time
+import signal
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+# cProfile, tracemalloc et tempfile ne sont importés que si le profilage est activé
+
+logger = logging.getLogger(__name__)
+
+# Marqueur de la dernière capture : route.ts lance un processus par document,
+# la limitation de fréquence doit donc survivre au processus
+LAST_CAPTURE_MARKER = '.last-capture'
+
+
+class ProfilerSettings(NamedTuple):
+    """Réglages de la capture des parsings lents"""
+    output_dir: str = ''            # vide : <tmp>/cv-genius-profiles
+    latency_threshold: float = 10.0  # secondes ; sous le budget de 20 s par document (lecture du PDF comprise), lui-même sous les 30 s de route.ts
+    memory_threshold_mb: float = 200.0  # pic d'allocations Python suivi par tracemalloc
+    top_n: int = 25                 # lignes les plus allocatrices enregistrées
+    min_interval: float = 300.0     # secondes au moins entre deux captures
+    max_captures: int = 50          # captures conservées dans le dossier
+
+
+def settings_from_env(force: bool = False) -> Optional[ProfilerSettings]:
+    """Réglages lus depuis l'environnement ; None si le profilage n'est pas demandé"""
+    if not (force or os.environ.get('CV_GENIUS_PROFILE') == '1'):
+        return None
+    defaults = ProfilerSettings()
+    return ProfilerSettings(
+        output_dir=os.environ.get('CV_GENIUS_PROFILE_DIR', defaults.output_dir),
+        latency_threshold=float(os.environ.get('CV_GENIUS_PROFILE_LATENCY', defaults.latency_threshold)),
+        memory_threshold_mb=float(os.environ.get('CV_GENIUS_PROFILE_MEMORY_MB', defaults.memory_threshold_mb)),
+        top_n=int(os.environ.get('CV_GENIUS_PROFILE_TOP', defaults.top_n)),
+        min_interval=float(os.environ.get('CV_GENIUS_PROFILE_INTERVAL', defaults.min_interval)),
+        max_captures=int(os.environ.get('CV_GENIUS_PROFILE_MAX', defaults.max_captures)),
+    )
+
+
+def _output_dir(settings: ProfilerSettings) -> Path:
+    import tempfile
+
+    return Path(settings.output_dir or os.path.join(tempfile.gettempdir(), 'cv-genius-profiles'))
+
+
+def _claim_capture(output_dir: Path, settings: ProfilerSettings) -> bool:
+    """Réserve une capture si la précédente date de plus de min_interval secondes"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    marker = output_dir / LAST_CAPTURE_MARKER
+    try:
+        if time.time() - marker.stat().st_mtime < settings.min_interval:
+            return False
+    except FileNotFoundError:
+        pass
+    marker.touch()
+    return True
+
+
+def _prune(output_dir: Path, max_captures: int) -> None:
+    """Supprime les captures les plus anciennes au-delà de max_captures"""
+    reports = sorted(output_dir.glob('*.json'))
+    for report in reports[:max(0, len(reports) - max_captures)]:
+        report.unlink(missing_ok=True)
+        report.with_suffix('.prof').unlink(missing_ok=True)
+
+
+def _pdf_sha256(pdf_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def profiled_parse(parse: Callable[[str], Dict[str, Any]], pdf_path: str,
+                   settings: ProfilerSettings) -> Dict[str, Any]:
+    """Appelle parse(pdf_path) sous cProfile et tracemalloc, et capture les documents trop lents ou trop gourmands
+
+    Une capture contient <horodatage>-<empreinte>.prof (lisible par pstats ou snakeviz) et un
+    rapport .json : empreinte SHA-256 du PDF (jamais son contenu ni son chemin), durée, pic
+    mémoire et top N des allocations encore en vie en fin de parsing. Une exception du parsing
+    est capturée puis relancée.
+
+    Le cas visé est le parsing que route.ts interrompt par SIGTERM après PYTHON_TIMEOUT : un
+    SIGTERM saute les blocs finally, un gestionnaire enregistre donc la capture du parsing en
+    cours avant de laisser le signal terminer le processus (thread principal uniquement).
+    """
+    import cProfile
+    import tracemalloc
+
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    started = time.monotonic()
+    captured = False
+
+    def capture(error: Optional[str], force: bool = False) -> None:
+        nonlocal captured
+        if captured:
+            return
+        captured = True
+        profiler.disable()
+        seconds = time.monotonic() - started
+        peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        slow = force or seconds >= settings.latency_threshold or peak_mb >= settings.memory_threshold_mb
+        snapshot = tracemalloc.take_snapshot() if slow else None
+        if started_tracing:
+            tracemalloc.stop()
+        if slow:
+            try:
+                _save_capture(profiler, snapshot, pdf_path, seconds, peak_mb, error, settings)
+            except OSError as e:
+                logger.warning(f"⚠️ Capture du parsing lent non enregistrée: {e}")
+
+    def on_sigterm(signum, frame) -> None:
+        capture("Interrompu par SIGTERM", force=True)
+        # Comportement d'origine (par défaut : fin du processus)
+        signal.signal(signal.SIGTERM, previous_handler)
+        signal.raise_signal(signal.SIGTERM)
+
+    # signal.signal() n'est permis que dans le thread principal
+    handles_sigterm = threading.current_thread() is threading.main_thread()
+    if handles_sigterm:
+        previous_handler = signal.signal(signal.SIGTERM, on_sigterm) or signal.SIG_DFL
+    error = None
+    try:
+        profiler.enable()
+        return parse(pdf_path)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        if handles_sigterm:
+            signal.signal(signal.SIGTERM, previous_handler)
+        capture(error)
+
+
+def _save_capture(profiler, snapshot, pdf_path: str, seconds: float, peak_mb: float,
+                  error: Optional[str], settings: ProfilerSettings) -> None:
+    output_dir = _output_dir(settings)
+    if not _claim_capture(output_dir, settings):
+        logger.info(f"⏱️ Parsing lent ({seconds:.1f}s, {peak_mb:.0f} Mo) non capturé: limite de fréquence")
+        return
+
+    pdf_sha256 = _pdf_sha256(pdf_path)
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{pdf_sha256[:12]}"
+    profiler.dump_stats(str(output_dir / f"{name}.prof"))
+
+    import tracemalloc
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    top = [
+        {'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+         'sizeKb': round(stat.size / 1024, 1), 'count': stat.count}
+        for stat in snapshot.statistics('lineno')[:settings.top_n]
+    ]
+    report = {
+        'pdfSha256': pdf_sha256,
+        'seconds': round(seconds, 3),
+        'peakMemoryMb': round(peak_mb, 1),
+        'latencyThreshold': settings.latency_threshold,
+        'memoryThresholdMb': settings.memory_threshold_mb,
+        'error': error,
+        'topAllocations': top,
+    }
+    (output_dir / f"{name}.json").write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    _prune(output_dir, settings.max_captures)
+    logger.warning(f"🐢 Parsing lent ({seconds:.1f}s, {peak_mb:.0f} Mo) capturé: {output_dir / name}.prof")
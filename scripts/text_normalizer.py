@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+CV Genius - Normalisation du texte
+Réparation Unicode des artefacts PDF et détection des titres de sections par lexique
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+from functools import cached_property, lru_cache
+from typing import Dict, List, Optional, Tuple, Union
+
+# Accents "espacés" que certains PDF émettent à côté de la lettre ("expe´rience")
+SPACING_ACCENTS = {
+    '\u00b4': '\u0301',  # ´ accent aigu
+    '`': '\u0300',       # accent grave
+    '\u00a8': '\u0308',  # ¨ tréma
+    '\u02c6': '\u0302',  # ˆ accent circonflexe
+    '\u02dc': '\u0303',  # ˜ tilde
+    '\u00b8': '\u0327',  # ¸ cédille
+}
+_SPACING_ACCENT_RE = re.compile('([A-Za-z]) ?([' + ''.join(SPACING_ACCENTS) + '])')
+
+# Ligatures que NFKD ne décompose pas
+LIGATURES = str.maketrans({'œ': 'oe', 'Œ': 'OE', 'æ': 'ae', 'Æ': 'AE'})
+
+_NON_LETTERS_RE = re.compile(r'[^a-z]+')
+_BULLETS_RE = re.compile(r'[•◦▪▫➤‣⁃]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Un titre de section est une ligne courte
+MAX_HEADER_LENGTH = 40
+MAX_HEADER_WORDS = 4
+
+# Nombre de lignes considérées comme l'en-tête du CV (nom, contact, liens)
+HEADER_REGION_LINES = 15
+
+# Lexique des titres de sections (forme lisible, normalisée au chargement du module)
+SECTION_HEADERS = {
+    'experience': [
+        'expérience', 'expérience professionnelle', 'expériences professionnelles',
+        'parcours professionnel', 'emploi', 'carrière',
+        'work experience', 'professional experience', 'employment', 'work history',
+    ],
+    'education': [
+        'formation', 'formations', 'éducation', 'education', 'diplômes', 'études',
+        'cursus', 'parcours académique', 'studies', 'degree', 'academic background',
+    ],
+    'skills': [
+        'compétences', 'compétences techniques', 'compétences informatiques',
+        'skills', 'technical skills', 'outils', 'tools', 'technologies',
+        'langages', 'frameworks',
+    ],
+    'languages': [
+        'langues', 'languages', 'compétences linguistiques', 'idiomas',
+    ],
+    # Projets personnels : pas des expériences professionnelles, mais ils terminent la section
+    'projects': [
+        'projets', 'projets personnels', 'projets académiques', 'projects', 'personal projects',
+    ],
+    # Titres qui terminent une section sans être extraits
+    'other': [
+        'certifications', 'certificats', 'loisirs', "centres d'intérêt", 'intérêts',
+        'hobbies', 'références', 'references', 'divers', 'profil', 'à propos',
+        'about me',
+    ],
+    # Bloc de coordonnées : souvent une colonne latérale intercalée dans le corps du CV, il ne
+    # termine donc pas la section en cours (voir header_region)
+    'contact': [
+        'contact', 'coordonnées',
+    ],
+}
+
+# Titres qui ne terminent pas la section en cours
+NON_TERMINATING_HEADERS = frozenset({'contact'})
+
+
+def repair_text(text: str) -> str:
+    """Répare les artefacts d'extraction PDF (accents espacés, ligatures, formes de compatibilité)"""
+    text = _SPACING_ACCENT_RE.sub(lambda m: m.group(1) + SPACING_ACCENTS[m.group(2)], text)
+    return unicodedata.normalize('NFKC', text)
+
+
+def fold_text(text: str) -> str:
+    """Forme de comparaison : NFKD, sans accents, sans ligatures, en minuscules"""
+    decomposed = unicodedata.normalize('NFKD', text.translate(LIGATURES))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).lower()
+
+
+def header_key(line: str) -> str:
+    """Clé de lexique d'une ligne : lettres repliées, mots au singulier, espaces uniques"""
+    words = _NON_LETTERS_RE.sub(' ', fold_text(repair_text(line))).split()
+    return ' '.join(word[:-1] if len(word) > 3 and word.endswith('s') else word for word in words)
+
+
+HEADER_LEXICON: Dict[str, str] = {
+    header_key(title): section_type
+    for section_type, titles in SECTION_HEADERS.items()
+    for title in titles
+}
+
+
+@lru_cache(maxsize=4096)
+def classify_header(line: str) -> Optional[str]:
+    """Retourne le type de section si la ligne est un titre connu, sinon None"""
+    line = line.strip()
+    if not line or len(line) > MAX_HEADER_LENGTH or len(line.split()) > MAX_HEADER_WORDS:
+        return None
+    return HEADER_LEXICON.get(header_key(line))
+
+
+class NormalizedText:
+    """Texte d'un CV normalisé une seule fois, exposé sous plusieurs vues mémorisées
+
+    - lines : lignes non vides, réparées, espaces compactés
+    - text  : vue structurée, lignes séparées par un saut de ligne
+    - flat  : vue à plat, lignes séparées par ' '
+
+    Les deux vues utilisent un séparateur d'un caractère : un même offset désigne
+    donc le même caractère dans text et flat, et line_offsets sert aux deux.
+    """
+
+    def __init__(self, raw: str):
+        repaired = _BULLETS_RE.sub('-', repair_text(raw))
+        lines = (_WHITESPACE_RE.sub(' ', line).strip() for line in repaired.split('\n'))
+        self.lines: List[str] = [line for line in lines if line]
+
+    @cached_property
+    def text(self) -> str:
+        return '\n'.join(self.lines)
+
+    @cached_property
+    def flat(self) -> str:
+        return ' '.join(self.lines)
+
+    @cached_property
+    def line_offsets(self) -> List[int]:
+        """Offset de début de chaque ligne dans text et flat"""
+        offsets = []
+        position = 0
+        for line in self.lines:
+            offsets.append(position)
+            position += len(line) + 1
+        return offsets
+
+    def line_at(self, offset: int) -> int:
+        """Index de la ligne contenant un offset de text ou flat"""
+        return max(0, bisect_right(self.line_offsets, offset) - 1)
+
+    @cached_property
+    def headers(self) -> List[Optional[str]]:
+        """Type de section de chaque ligne (None si ce n'est pas un titre)"""
+        return [classify_header(line) for line in self.lines]
+
+    @cached_property
+    def section_spans(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Intervalles de lignes [début, fin) des sections de chaque type, titre inclus, dans l'ordre
+
+        Une section court jusqu'au titre suivant (un bloc CONTACT ne l'interrompt pas). Un titre
+        suivi immédiatement d'un autre titre vient d'une rangée de titres sur deux colonnes
+        (EXPÉRIENCES / CERTIFICATS) : sa section s'étend sur le corps de la section suivante.
+        """
+        starts = [i for i, header in enumerate(self.headers)
+                  if header is not None and header not in NON_TERMINATING_HEADERS]
+        ends = starts[1:] + [len(self.lines)]
+        for i in range(len(starts) - 2, -1, -1):
+            if ends[i] == starts[i] + 1:
+                ends[i] = ends[i + 1]
+        spans: Dict[str, List[Tuple[int, int]]] = {}
+        for start, end in zip(starts, ends):
+            spans.setdefault(self.headers[start], []).append((start, end))
+        return spans
+
+    def section_lines(self, section_type: str) -> List[str]:
+        """Lignes de toutes les sections du type, titres inclus"""
+        return [line for start, end in self.section_spans.get(section_type, [])
+                for line in self.lines[start:end]]
+
+    def section_text(self, section_type: str) -> str:
+        lines = self.section_lines(section_type)
+        return '\n'.join(lines) + '\n' if lines else ''
+
+
+def as_document(text: Union[str, 'NormalizedText']) -> NormalizedText:
+    """Normalise une chaîne, ou renvoie tel quel un texte déjà normalisé"""
+    return text if isinstance(text, NormalizedText) else NormalizedText(text)
+
+
+def header_region(lines: List[str], max_lines: int = HEADER_REGION_LINES) -> List[str]:
+    """En-tête d'un CV : les premières lignes, prolongées jusqu'à la fin du bloc CONTACT où qu'il commence"""
+    region = lines[:max_lines]
+    for i, line in enumerate(lines):
+        if classify_header(line) == 'contact':
+            end = i + 1
+            for line in lines[i + 1:i + max_lines]:
+                if classify_header(line) is not None:
+                    break
+                end += 1
+            if i < max_lines:
+                # Bloc CONTACT commencé dans l'en-tête : l'en-tête s'étend jusqu'à sa fin
+                region = lines[:max(max_lines, end)]
+            else:
+                region.extend(lines[i:end])
+            break
+    return region
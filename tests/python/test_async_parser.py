@@ -0,0 +1,139 @@
+# test_async_parser.py
+import asyncio
+import importlib.util
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import async_parser  # noqa: E402
+from async_parser import parse_cv_async, parse_many_async  # noqa: E402
+import pdf_parser_improved  # noqa: E402
+from cv_models import ParsedCV, PersonalInfo  # noqa: E402
+from pdf_parser_improved import ImprovedCVParser  # noqa: E402
+from pdf_reader import PdfContent  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parents[1] / "e2e" / "fixtures" / "CV_test.pdf"
+HAS_PDFPLUMBER = importlib.util.find_spec("pdfplumber") is not None
+
+CV_TEXT = """Jean Dupont
+EXPÉRIENCES PROFESSIONNELLES
+Développeur Full Stack - TechCorp Paris 01/2022 - Présent
+Développement d'applications web avec React et Node.js
+FORMATION
+Master Informatique - Université Paris-Saclay 2018 - 2020
+"""
+
+
+class FakeParser:
+    """Parser factice : le nom du fichier donne la durée du parsing"""
+
+    def __init__(self, time_budget=None):
+        self.time_budget = time_budget
+
+    def parse_cv_model(self, pdf_path):
+        name = Path(pdf_path).stem
+        if name == "broken":
+            raise ValueError("PDF illisible")
+        delay = float(name) if name.replace(".", "").isdigit() else 0
+        time.sleep(delay)
+        return ParsedCV(PersonalInfo.from_dict({"name": name}), [], [], [], [], {"budget": self.time_budget})
+
+
+class AsyncParserTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(async_parser, "ImprovedCVParser", FakeParser)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.executor = ThreadPoolExecutor(max_workers=4)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_parse_cv_async_returns_the_parse_result(self):
+        result = asyncio.run(parse_cv_async("/tmp/cv.pdf", executor=self.executor))
+        self.assertEqual(result.personal_info.name, "cv")
+
+    def test_parse_cv_async_accepts_raw_bytes(self):
+        result = asyncio.run(parse_cv_async(b"%PDF-1.4", executor=self.executor))
+        self.assertIsInstance(result, ParsedCV)
+
+    def test_timeout_raises_and_bounds_the_worker_budget(self):
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(parse_cv_async("/tmp/0.5.pdf", timeout=0.05, executor=self.executor))
+        result = asyncio.run(parse_cv_async("/tmp/cv.pdf", timeout=5, executor=self.executor))
+        self.assertEqual(result.meta, {"budget": 5})
+        result = asyncio.run(parse_cv_async("/tmp/cv.pdf", executor=self.executor))
+        self.assertEqual(result.meta, {"budget": async_parser.DEFAULT_TIME_BUDGET})
+
+    def test_parse_many_yields_in_completion_order_and_isolates_errors(self):
+        async def collect():
+            sources = ["/tmp/0.3.pdf", "/tmp/broken.pdf", "/tmp/0.pdf"]
+            return [outcome async for outcome in parse_many_async(sources, concurrency=3, executor=self.executor)]
+
+        outcomes = asyncio.run(collect())
+        self.assertEqual([outcome.index for outcome in outcomes][-1], 0)
+        by_index = {outcome.index: outcome for outcome in outcomes}
+        self.assertIsInstance(by_index[1].error, ValueError)
+        self.assertEqual(by_index[2].result.personal_info.name, "0")
+
+    def test_parse_many_limits_concurrency_and_consumes_sources_lazily(self):
+        consumed = []
+
+        def sources():
+            for i in range(10):
+                consumed.append(i)
+                yield f"/tmp/doc{i}.pdf"
+
+        async def first_outcome():
+            async for outcome in parse_many_async(sources(), concurrency=2, executor=self.executor):
+                return outcome
+
+        outcome = asyncio.run(first_outcome())
+        self.assertIsNone(outcome.error)
+        self.assertLessEqual(len(consumed), 3)
+
+    def test_rejects_invalid_concurrency(self):
+        async def run():
+            async for _ in parse_many_async([], concurrency=0):
+                pass
+
+        with self.assertRaises(ValueError):
+            asyncio.run(run())
+
+
+class WorkerParserTest(unittest.TestCase):
+    """Vrai _parse_in_worker, sans parser factice"""
+
+    def test_overlapping_budgets_in_a_thread_pool_stay_separate(self):
+        def slow_read_pdf(pdf_path, ocr=None, budget=None):
+            time.sleep(0.4 if "slow" in pdf_path else 0.05)
+            return PdfContent(CV_TEXT, [], {}, [])
+
+        with mock.patch.object(pdf_parser_improved, "read_pdf", side_effect=slow_read_pdf), \
+                ThreadPoolExecutor(max_workers=2) as executor:
+            # Même budget, et le document rapide se termine pendant la lecture du lent
+            slow = executor.submit(async_parser._parse_in_worker, "/tmp/slow.pdf", 0.2)
+            time.sleep(0.01)
+            fast = executor.submit(async_parser._parse_in_worker, "/tmp/fast.pdf", 0.2)
+            slow, fast = slow.result(), fast.result()
+        self.assertIsNone(fast.meta)
+        self.assertTrue(slow.meta["partial"])
+        self.assertEqual(slow.meta["timeBudget"], 0.2)
+        self.assertEqual(slow.experiences, [])
+
+    @unittest.skipUnless(HAS_PDFPLUMBER, "pdfplumber n'est pas installé")
+    def test_process_pool_returns_the_model(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = asyncio.run(parse_cv_async(str(FIXTURE), executor=executor))
+            from_bytes = asyncio.run(parse_cv_async(FIXTURE.read_bytes(), executor=executor))
+        self.assertIsInstance(result, ParsedCV)
+        expected = ImprovedCVParser().parse_cv(str(FIXTURE))
+        self.assertEqual(result.to_dict(), expected)
+        self.assertEqual(from_bytes.to_dict(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+# test_batch_ingest.py
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from batch_ingest import STATUS_DONE, BatchIngestor, Checkpoint, ResultChunkWriter, find_pdfs  # noqa: E402
+from cv_models import ParsedCV  # noqa: E402
+
+
+class RecordingParser:
+    """Parser factice qui note les fichiers parsés et échoue sur demande"""
+
+    def __init__(self, failures=None, results=None):
+        self.calls = []
+        self.failures = dict(failures or {})
+        # Résultats imposés par fichier (vide, partiel...)
+        self.results = dict(results or {})
+
+    def __call__(self, path):
+        self.calls.append(Path(path).name)
+        name = Path(path).name
+        if self.failures.get(name, 0) > 0:
+            self.failures[name] -= 1
+            raise ValueError("PDF illisible")
+        return ParsedCV.from_dict(self.results.get(name, {"personalInfo": {"name": name}}))
+
+
+class BufferingSink:
+    """Export factice qui n'écrit ses lignes que par lots, comme ArrowSink"""
+
+    def __init__(self, batch_size):
+        self.batch_size = batch_size
+        self.buffer = []
+        self.written = []
+
+    def write(self, path, sha256, result):
+        self.buffer.append(Path(path).name)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    @property
+    def pending(self):
+        return len(self.buffer)
+
+    def flush(self):
+        self.written.extend(self.buffer)
+        self.buffer = []
+
+
+class BatchIngestTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.archive = self.root / "archive"
+        self.archive.mkdir()
+        for name in ("a.pdf", "b.pdf", "c.pdf"):
+            (self.archive / name).write_bytes(name.encode())
+        (self.archive / "notes.txt").write_text("ignoré")
+        self.output = self.root / "out"
+
+    def run_batch(self, parser, chunk_size=2, max_attempts=3):
+        checkpoint = Checkpoint(self.output / "checkpoint.sqlite")
+        writer = ResultChunkWriter(self.output, chunk_size=chunk_size)
+        try:
+            return BatchIngestor(parser, checkpoint, writer, max_attempts=max_attempts).run(find_pdfs(self.archive))
+        finally:
+            writer.close()
+            checkpoint.close()
+
+    def result_lines(self):
+        lines = []
+        for chunk in sorted(self.output.glob("results-*.jsonl")):
+            lines.extend(json.loads(line) for line in chunk.read_text().splitlines())
+        return lines
+
+    def test_restart_skips_finished_files(self):
+        first = RecordingParser()
+        self.assertEqual(self.run_batch(first), {"parsed": 3, "skipped": 0, "failed": 0})
+        self.assertEqual(first.calls, ["a.pdf", "b.pdf", "c.pdf"])
+
+        second = RecordingParser()
+        self.assertEqual(self.run_batch(second), {"parsed": 0, "skipped": 3, "failed": 0})
+        self.assertEqual(second.calls, [])
+
+    def test_results_are_written_in_append_only_chunks(self):
+        self.run_batch(RecordingParser(), chunk_size=2)
+        (self.archive / "d.pdf").write_bytes(b"d")
+        self.run_batch(RecordingParser(), chunk_size=2)
+
+        chunks = sorted(path.name for path in self.output.glob("results-*.jsonl"))
+        self.assertEqual(chunks, ["results-000001.jsonl", "results-000002.jsonl", "results-000003.jsonl"])
+        self.assertEqual([line["result"]["personalInfo"]["name"] for line in self.result_lines()],
+                         ["a.pdf", "b.pdf", "c.pdf", "d.pdf"])
+
+    def test_modified_files_are_parsed_again(self):
+        self.run_batch(RecordingParser())
+        (self.archive / "b.pdf").write_bytes(b"nouvelle version")
+        # Même contenu réécrit : la date change mais l'empreinte non
+        (self.archive / "c.pdf").write_bytes(b"c.pdf")
+        os.utime(self.archive / "c.pdf", ns=(1, 1))
+
+        parser = RecordingParser()
+        self.assertEqual(self.run_batch(parser), {"parsed": 1, "skipped": 2, "failed": 0})
+        self.assertEqual(parser.calls, ["b.pdf"])
+
+    def test_failures_are_retried_up_to_the_cap(self):
+        parser = RecordingParser(failures={"b.pdf": 1})
+        self.assertEqual(self.run_batch(parser), {"parsed": 3, "skipped": 0, "failed": 0})
+        self.assertEqual(parser.calls.count("b.pdf"), 2)
+
+        parser = RecordingParser(failures={"a.pdf": 5})
+        self.output = self.root / "out-2"
+        self.assertEqual(self.run_batch(parser, max_attempts=2), {"parsed": 2, "skipped": 0, "failed": 1})
+        # Abandonné : un redémarrage ne le retente pas tant que le fichier ne change pas
+        parser = RecordingParser()
+        self.assertEqual(self.run_batch(parser, max_attempts=2), {"parsed": 0, "skipped": 3, "failed": 0})
+        # Un plafond relevé redonne des essais au fichier en échec
+        self.assertEqual(self.run_batch(parser, max_attempts=3), {"parsed": 1, "skipped": 2, "failed": 0})
+
+    def test_empty_results_count_as_failed_attempts(self):
+        # read_pdf avale les erreurs : un PDF corrompu donne un résultat vide
+        empty = {"personalInfo": {}, "experiences": [], "education": [], "skills": [], "languages": []}
+        parser = RecordingParser(results={"b.pdf": empty})
+        self.assertEqual(self.run_batch(parser, max_attempts=2), {"parsed": 2, "skipped": 0, "failed": 1})
+        self.assertEqual(parser.calls.count("b.pdf"), 2)
+        self.assertNotIn("b.pdf", [Path(line["path"]).name for line in self.result_lines()])
+        # Le fichier réparé est reparsé au prochain lancement si le plafond est relevé
+        self.assertEqual(self.run_batch(RecordingParser(), max_attempts=3), {"parsed": 1, "skipped": 2, "failed": 0})
+
+    def test_partial_results_are_kept_without_reparsing(self):
+        # Même budget, même expiration : un nouvel essai ne ferait que recommencer
+        partial = {"personalInfo": {"name": "b.pdf"}, "meta": {"partial": True}}
+        parser = RecordingParser(results={"b.pdf": partial})
+        self.assertEqual(self.run_batch(parser), {"parsed": 3, "skipped": 0, "failed": 0})
+        self.assertEqual(parser.calls.count("b.pdf"), 1)
+        self.assertEqual([Path(line["path"]).name for line in self.result_lines()].count("b.pdf"), 1)
+
+        parser = RecordingParser()
+        self.assertEqual(self.run_batch(parser), {"parsed": 0, "skipped": 3, "failed": 0})
+        self.assertEqual(parser.calls, [])
+
+    def test_attempt_that_kills_the_process_counts_towards_the_cap(self):
+        class Crash(BaseException):
+            """Arrêt brutal du processus pendant le parsing (segfault, mémoire, kill)"""
+
+        def crashing_parser(path):
+            if Path(path).name == "b.pdf":
+                raise Crash()
+            return ParsedCV.from_dict({"personalInfo": {"name": Path(path).name}})
+
+        for _ in range(2):
+            with self.assertRaises(Crash):
+                self.run_batch(crashing_parser, max_attempts=2)
+        # Deux essais interrompus : b.pdf est abandonné au lieu d'être retenté à chaque démarrage
+        parser = RecordingParser()
+        self.assertEqual(self.run_batch(parser, max_attempts=2), {"parsed": 1, "skipped": 2, "failed": 0})
+        self.assertEqual(parser.calls, ["c.pdf"])
+        checkpoint = Checkpoint(self.output / "checkpoint.sqlite")
+        self.addCleanup(checkpoint.close)
+        record = checkpoint.load()[str(self.archive / "b.pdf")]
+        self.assertEqual((record["status"], record["attempts"]), ("failed", 2))
+
+    def test_files_are_checkpointed_only_once_their_export_is_written(self):
+        checkpoint = Checkpoint(self.output / "checkpoint.sqlite")
+        writer = ResultChunkWriter(self.output)
+        self.addCleanup(checkpoint.close)
+        self.addCleanup(writer.close)
+        sink = BufferingSink(batch_size=2)
+        recorded = {}
+
+        def parse(path):
+            # État du point de reprise tel qu'un arrêt brutal le laisserait
+            recorded[Path(path).name] = sorted(Path(key).name for key, record in checkpoint.load().items()
+                                               if record["status"] == STATUS_DONE)
+            return ParsedCV.from_dict({"personalInfo": {"name": Path(path).name}})
+
+        BatchIngestor(parse, checkpoint, writer, sinks=[sink]).run(find_pdfs(self.archive))
+        self.assertEqual(recorded, {"a.pdf": [], "b.pdf": [], "c.pdf": ["a.pdf", "b.pdf"]})
+        # Fin du lot : le dernier lot partiel est écrit, puis enregistré
+        self.assertEqual(sink.written, ["a.pdf", "b.pdf", "c.pdf"])
+        self.assertEqual(sorted(Path(key).name for key in checkpoint.load()), ["a.pdf", "b.pdf", "c.pdf"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# test_cli_startup.py
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+SCRIPTS = ["pdf_parser.py", "pdf_parser_improved.py"]
+SAMPLE_PDF = ROOT / "tests" / "e2e" / "fixtures" / "CV_test.pdf"
+
+# Modules lourds qui ne doivent être importés qu'à l'ouverture d'un PDF
+DEFERRED_MODULES = {"pdfplumber", "pdfminer", "spacy", "pypdfium2", "PIL"}
+
+
+def import_times(script):
+    """Lance `python -X importtime <script> --help` et renvoie {module de premier niveau: µs cumulées}"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "scripts" / script), "--help"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Les sous-imports sont indentés sous leur parent
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+class CliStartupTest(unittest.TestCase):
+    def test_help_does_not_import_heavy_dependencies(self):
+        for script in SCRIPTS:
+            with self.subTest(script=script):
+                imported = {name.split(".")[0] for name in import_times(script)}
+                self.assertFalse(imported & DEFERRED_MODULES)
+
+    def test_importing_the_parsers_leaves_heavy_dependencies_unloaded(self):
+        # Import en tant que module (services Python, async_parser) : mêmes exigences que la CLI
+        checker = (
+            "import sys; sys.path.insert(0, sys.argv[1]); "
+            "import pdf_parser, pdf_parser_improved, async_parser, batch_ingest; "
+            "print(','.join(sorted({name.split('.')[0] for name in sys.modules})))"
+        )
+        completed = subprocess.run([sys.executable, "-c", checker, str(ROOT / "scripts")],
+                                   capture_output=True, text=True, check=True)
+        self.assertFalse(set(completed.stdout.strip().split(",")) & DEFERRED_MODULES)
+
+    def test_missing_pdfplumber_fails_fast_without_installing(self):
+        # pdfplumber masqué : le parsing doit s'arrêter avec un message clair, sans pip install
+        runner = (
+            "import os, runpy, sys; sys.modules['pdfplumber'] = None; "
+            "sys.argv = sys.argv[1:]; sys.path.insert(0, os.path.dirname(sys.argv[0])); "
+            "runpy.run_path(sys.argv[0], run_name='__main__')"
+        )
+        for script in SCRIPTS:
+            with self.subTest(script=script):
+                completed = subprocess.run(
+                    [sys.executable, "-c", runner, str(ROOT / "scripts" / script), str(SAMPLE_PDF)],
+                    capture_output=True,
+                    text=True,
+                    timeout=30,
+                )
+                self.assertEqual(completed.returncode, 2)
+                self.assertIn("pdfplumber n'est pas installé", completed.stderr)
+                self.assertEqual(completed.stdout, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
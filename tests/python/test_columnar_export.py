@@ -0,0 +1,189 @@
+# test_columnar_export.py
+import importlib.util
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from columnar_export import SqliteSink, open_export_sink, result_rows  # noqa: E402
+from cv_models import ParsedCV  # noqa: E402
+
+HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+RESULT = ParsedCV.from_dict({
+    "personalInfo": {"name": "Jean Dupont", "email": "jean.dupont@email.com", "phone": "06 12 34 56 78"},
+    "experiences": [{
+        "id": "exp-1-0", "position": "Développeur", "company": "TechCorp", "location": "",
+        "startDate": "01/2022", "endDate": "", "description": "React et Node.js", "isCurrentPosition": True,
+    }],
+    "education": [{
+        "id": "edu-1-0", "degree": "Master Informatique", "institution": "Université Paris-Saclay",
+        "field": "", "startDate": "2018", "endDate": "2020", "description": "",
+    }],
+    "skills": [
+        {"id": "skill-1-0", "name": "Python", "category": "technical", "level": "intermediate"},
+        {"id": "skill-2-1", "name": "React", "category": "technical", "level": "intermediate"},
+    ],
+    "languages": [{"id": "lang-1-0", "name": "Anglais", "level": "Courant"}],
+})
+
+
+class ResultRowsTest(unittest.TestCase):
+    def test_one_row_per_item_linked_by_cv_id(self):
+        rows = result_rows("abc", "cvs/jean.pdf", RESULT)
+        self.assertEqual(rows["cvs"], [("abc", "cvs/jean.pdf", "Jean Dupont", "jean.dupont@email.com", None, False)])
+        self.assertEqual(rows["experiences"],
+                         [("abc", "Développeur", "TechCorp", None, "01/2022", None, True, "React et Node.js")])
+        self.assertEqual([row[1] for row in rows["skills"]], ["Python", "React"])
+        self.assertEqual(rows["languages"], [("abc", "Anglais", "Courant")])
+
+    def test_partial_results_are_flagged(self):
+        rows = result_rows("abc", "cv.pdf", ParsedCV.from_dict({"personalInfo": {}, "meta": {"partial": True}}))
+        self.assertTrue(rows["cvs"][0][-1])
+        self.assertEqual(rows["skills"], [])
+
+
+class SqliteSinkTest(unittest.TestCase):
+    def setUp(self):
+        self.db_path = Path(tempfile.mkdtemp()) / "cv_export.sqlite"
+
+    def test_reparsed_cv_replaces_its_rows(self):
+        sink = SqliteSink(self.db_path)
+        sink.write("jean.pdf", "abc", RESULT)
+        sink.write("marie.pdf", "def", ParsedCV.from_dict({**RESULT.to_dict(), "skills": RESULT.to_dict()["skills"][:1]}))
+        sink.write("jean.pdf", "abc", RESULT)
+        sink.close()
+
+        connection = sqlite3.connect(str(self.db_path))
+        self.addCleanup(connection.close)
+        counts = connection.execute(
+            "SELECT name, COUNT(*) FROM skills GROUP BY name ORDER BY name").fetchall()
+        self.assertEqual(counts, [("Python", 2), ("React", 1)])
+        self.assertEqual(connection.execute("SELECT COUNT(*) FROM cvs").fetchone()[0], 2)
+
+    def test_modified_file_replaces_its_previous_version(self):
+        sink = SqliteSink(self.db_path)
+        sink.write("jean.pdf", "abc", RESULT)
+        sink.write("jean.pdf", "abc2", RESULT)
+        sink.compact()
+        sink.close()
+
+        connection = sqlite3.connect(str(self.db_path))
+        self.addCleanup(connection.close)
+        self.assertEqual(connection.execute("SELECT cv_id, path FROM cvs").fetchall(), [("abc2", "jean.pdf")])
+        self.assertEqual(connection.execute("SELECT DISTINCT cv_id FROM skills").fetchall(), [("abc2",)])
+
+
+class OpenExportSinkTest(unittest.TestCase):
+    @unittest.skipIf(HAS_PYARROW, "pyarrow est installé")
+    def test_falls_back_to_sqlite_without_pyarrow(self):
+        output_dir = Path(tempfile.mkdtemp())
+        sink = open_export_sink(output_dir, "parquet")
+        self.addCleanup(sink.close)
+        self.assertIsInstance(sink, SqliteSink)
+        self.assertTrue((output_dir / "cv_export.sqlite").exists())
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow n'est pas installé")
+    def test_parquet_parts_are_appended_per_table(self):
+        import pyarrow.dataset as ds
+
+        output_dir = Path(tempfile.mkdtemp())
+        sink = open_export_sink(output_dir, "parquet", batch_size=1)
+        sink.write("jean.pdf", "abc", RESULT)
+        sink.write("marie.pdf", "def", RESULT)
+        sink.close()
+
+        self.assertEqual(len(list((output_dir / "skills").glob("part-*.parquet"))), 2)
+        skills = ds.dataset(str(output_dir / "skills"), format="parquet").to_table(columns=["name"])
+        self.assertEqual(skills.column("name").to_pylist(), ["Python", "React", "Python", "React"])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow n'est pas installé")
+    def test_pending_counts_cvs_not_yet_on_disk(self):
+        output_dir = Path(tempfile.mkdtemp())
+        sink = open_export_sink(output_dir, "parquet", batch_size=2)
+        sink.write("jean.pdf", "abc", RESULT)
+        self.assertEqual(sink.pending, 1)
+        self.assertEqual(list((output_dir / "cvs").glob("part-*")), [])
+        sink.flush()
+        self.assertEqual(sink.pending, 0)
+        self.assertEqual(len(list((output_dir / "cvs").glob("part-*.parquet"))), 1)
+        sink.close()
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow n'est pas installé")
+    def test_arrow_ipc_parts_are_memory_mappable(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        output_dir = Path(tempfile.mkdtemp())
+        sink = open_export_sink(output_dir, "arrow", batch_size=1)
+        sink.write("jean.pdf", "abc", RESULT)
+        sink.write("marie.pdf", "def", RESULT)
+        sink.close()
+
+        parts = sorted((output_dir / "cvs").glob("part-*.arrow"))
+        self.assertEqual(len(parts), 2)
+        with pa.memory_map(str(parts[0])) as source:
+            self.assertEqual(pa.ipc.open_file(source).read_all().column("name").to_pylist(), ["Jean Dupont"])
+        skills = ds.dataset(str(output_dir / "skills"), format="arrow").to_table(columns=["cv_id"])
+        self.assertEqual(skills.column("cv_id").to_pylist(), ["abc", "abc", "def", "def"])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow n'est pas installé")
+    def test_interrupted_write_leaves_no_truncated_part(self):
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        def crash(table, where):
+            Path(where).write_bytes(b"PAR1 tronqu")
+            raise OSError("disque plein")
+
+        output_dir = Path(tempfile.mkdtemp())
+        sink = open_export_sink(output_dir, "parquet", batch_size=1)
+        sink.write("jean.pdf", "abc", RESULT)
+        with mock.patch.object(pq, "write_table", side_effect=crash), self.assertRaises(OSError):
+            sink.write("marie.pdf", "def", RESULT)
+
+        self.assertEqual(len(list((output_dir / "cvs").glob("part-*"))), 1)
+        cvs = ds.dataset(str(output_dir / "cvs"), format="parquet").to_table()
+        self.assertEqual(cvs.column("cv_id").to_pylist(), ["abc"])
+        # Le fichier temporaire d'une écriture interrompue est supprimé au prochain lancement
+        open_export_sink(output_dir, "parquet").close()
+        self.assertEqual(list((output_dir / "cvs").glob(".part-*")), [])
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow n'est pas installé")
+    def test_compact_keeps_the_latest_version_of_each_cv_and_path(self):
+        import pyarrow.dataset as ds
+
+        for file_format in ("parquet", "arrow"):
+            with self.subTest(file_format=file_format):
+                output_dir = Path(tempfile.mkdtemp())
+                sink = open_export_sink(output_dir, file_format, batch_size=10)
+                sink.write("jean.pdf", "abc", RESULT)
+                sink.write("marie.pdf", "def", RESULT)
+                # Même lot : le CV reparsé ouvre une nouvelle partie
+                sink.write("jean.pdf", "abc", RESULT)
+                sink.flush()
+                # jean.pdf modifié : nouvelle empreinte pour le même chemin
+                sink.write("jean.pdf", "abc2", ParsedCV.from_dict({**RESULT.to_dict(), "skills": []}))
+                sink.compact()
+                sink.close()
+
+                self.assertEqual(len(list((output_dir / "cvs").glob("part-*"))), 1)
+                cvs = ds.dataset(str(output_dir / "cvs"), format=file_format).to_table()
+                self.assertEqual(sorted(zip(cvs.column("cv_id").to_pylist(), cvs.column("path").to_pylist())),
+                                 [("abc2", "jean.pdf"), ("def", "marie.pdf")])
+                skills = ds.dataset(str(output_dir / "skills"), format=file_format).to_table()
+                self.assertEqual(skills.column("cv_id").to_pylist(), ["def", "def"])
+                experiences = ds.dataset(str(output_dir / "experiences"), format=file_format).to_table()
+                self.assertEqual(sorted(experiences.column("cv_id").to_pylist()), ["abc2", "def"])
+
+    def test_rejects_unknown_format(self):
+        with self.assertRaises(ValueError):
+            open_export_sink(Path(tempfile.mkdtemp()), "csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+# test_near_duplicates.py
+import importlib.util
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from cv_models import ParsedCV, Skill  # noqa: E402
+from near_duplicates import NearDuplicateIndex, minhash_signature, similarity  # noqa: E402
+from pdf_parser_improved import ImprovedCVParser  # noqa: E402
+from pdf_reader import PdfContent, read_pdf  # noqa: E402
+from text_normalizer import NormalizedText  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parents[1] / "e2e" / "fixtures" / "CV_test.pdf"
+HAS_PDFPLUMBER = importlib.util.find_spec("pdfplumber") is not None
+
+CV_TEXT = """Jean Dupont
+jean.dupont@email.com | 06 12 34 56 78
+Développeur full-stack passionné par les applications web performantes et accessibles
+EXPÉRIENCES PROFESSIONNELLES
+Développeur Full Stack - TechCorp Paris 01/2022 - Présent
+Développement d'applications web avec React et Node.js pour une clientèle internationale
+Mise en place de l'intégration continue et des revues de code pour une équipe de huit personnes
+Stagiaire Développeur - StartupXYZ Lyon 06/2020 - 12/2021
+Création d'une API REST en Python et Flask, tests automatisés et documentation technique
+FORMATION
+Master Informatique - Université Paris-Saclay 2018 - 2020
+Licence Informatique - Université Lyon 1 2015 - 2018
+COMPÉTENCES TECHNIQUES
+Langages : Python, JavaScript, TypeScript, SQL
+Frameworks : React, Node.js, Flask, Django
+LANGUES
+Français (Natif)
+Anglais (Courant)
+"""
+
+
+class MinHashTest(unittest.TestCase):
+    def test_similar_texts_have_close_signatures(self):
+        edited = CV_TEXT.replace("06 12 34 56 78", "07 98 76 54 32")
+        base = minhash_signature(NormalizedText(CV_TEXT).lines)
+        self.assertGreaterEqual(similarity(base, minhash_signature(NormalizedText(edited).lines)), 0.8)
+        other = minhash_signature(["Marie Curie", "Physicienne et chimiste, prix Nobel 1903 et 1911"])
+        self.assertLess(similarity(base, other), 0.2)
+
+    def test_signature_is_stable_across_runs(self):
+        lines = NormalizedText(CV_TEXT).lines
+        self.assertEqual(minhash_signature(lines), minhash_signature(list(lines)))
+
+
+class SectionKeysTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = ImprovedCVParser(time_budget=None)
+        self.keys = self.parser.section_keys(CV_TEXT)
+
+    def changed(self, edited):
+        keys = self.parser.section_keys(edited)
+        return {key for key in keys if keys[key] != self.keys[key]}
+
+    def test_header_edit_changes_no_section(self):
+        self.assertEqual(self.changed(CV_TEXT.replace("06 12 34 56 78", "07 98 76 54 32")), set())
+
+    def test_edit_changes_the_sections_whose_extractor_reads_the_line(self):
+        self.assertEqual(self.changed(CV_TEXT.replace("2018 - 2020", "2018 - 2021")), {"education"})
+        # La description d'une formation lit jusqu'à 7 lignes après ses dates, au-delà du titre suivant
+        self.assertEqual(self.changed(CV_TEXT.replace("Anglais (Courant)", "Anglais (Bilingue)")),
+                         {"education", "languages"})
+
+    def test_lines_read_past_a_contact_block_belong_to_the_section(self):
+        # Mise en page du CV de test : le bloc CONTACT s'intercale entre les dates et l'établissement
+        text = "Jean Dupont\nFORMATION\n2023 - présent\nCONTACT\nINSA TOULOUSE - Ingénieur\n06 12 34 56 78\n"
+        keys = self.parser.section_keys(text)
+        edited = self.parser.section_keys(text.replace("INSA TOULOUSE", "INSA LYON"))
+        self.assertNotEqual(keys["education"], edited["education"])
+        self.assertEqual(keys["skills"], edited["skills"])
+
+
+class NearDuplicateIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.db_path = Path(tempfile.mkdtemp()) / "near-duplicates.sqlite"
+
+    def test_index_is_persistent(self):
+        index = NearDuplicateIndex(self.db_path)
+        skills = [{"id": "skill-1-0", "name": "Python", "category": "technical", "level": "advanced"}]
+        index.add(NormalizedText(CV_TEXT), ParsedCV.from_dict({"skills": skills}), {"skills": "abc"})
+        index.close()
+
+        index = NearDuplicateIndex(self.db_path, cache_size=0)
+        self.addCleanup(index.close)
+        match = index.query(NormalizedText(CV_TEXT.replace("TechCorp", "TechCorp SAS")))
+        self.assertIsNotNone(match)
+        self.assertEqual(match.result.skills, [Skill("skill-1-0", "Python", "technical", "advanced")])
+        self.assertEqual(match.section_keys, {"skills": "abc"})
+        self.assertIsNone(index.query(NormalizedText("Marie Curie\nPhysicienne et chimiste")))
+
+    def test_memory_cache_is_bounded(self):
+        index = NearDuplicateIndex(self.db_path, cache_size=2)
+        self.addCleanup(index.close)
+        for i in range(5):
+            index.add(NormalizedText(f"Candidat {i}\n" + CV_TEXT * (i + 1)), ParsedCV.empty(), {})
+        self.assertEqual(len(index), 5)
+        self.assertEqual(len(index._cache), 2)
+
+    def test_index_of_an_older_format_is_rebuilt(self):
+        import sqlite3
+
+        connection = sqlite3.connect(str(self.db_path))
+        connection.execute("CREATE TABLE documents (id INTEGER PRIMARY KEY, lines BLOB)")
+        connection.commit()
+        connection.close()
+        index = NearDuplicateIndex(self.db_path)
+        self.addCleanup(index.close)
+        index.add(NormalizedText(CV_TEXT), ParsedCV.empty(), {})
+        self.assertEqual(len(index), 1)
+
+    def test_query_is_sub_millisecond(self):
+        index = NearDuplicateIndex(self.db_path)
+        self.addCleanup(index.close)
+        docs = [NormalizedText("\n".join(f"ligne {j} du candidat {i} mot{i * j}" for j in range(40)))
+                for i in range(200)]
+        signatures = [minhash_signature(doc.lines) for doc in docs]
+        for doc, signature in zip(docs, signatures):
+            index.add(doc, ParsedCV.empty(), {}, signature)
+
+        started = time.perf_counter()
+        for doc, signature in zip(docs, signatures):
+            index.query(doc, signature)
+        self.assertLess((time.perf_counter() - started) / len(docs), 0.001)
+
+
+class ParserReuseTest(unittest.TestCase):
+    def setUp(self):
+        # Seuil abaissé : sur un CV aussi court, deux retouches suffisent à passer sous 95 %
+        self.index = NearDuplicateIndex(Path(tempfile.mkdtemp()) / "near-duplicates.sqlite", threshold=0.8)
+        self.addCleanup(self.index.close)
+        self.parser = ImprovedCVParser(time_budget=None, duplicate_index=self.index)
+
+    def parse(self, text):
+        content = PdfContent(text, [], {}, [])
+        with mock.patch.object(self.parser, "read_pdf", return_value=content), \
+                mock.patch.object(self.parser, "extract_education", wraps=self.parser.extract_education) as education, \
+                mock.patch.object(self.parser, "extract_languages", wraps=self.parser.extract_languages) as languages:
+            result = self.parser.parse_cv("cv.pdf")
+        return result, education.call_count, languages.call_count
+
+    def test_near_duplicate_reuses_unchanged_sections(self):
+        first, education_calls, _ = self.parse(CV_TEXT)
+        self.assertEqual(education_calls, 1)
+        self.assertNotIn("meta", first)
+
+        edited = CV_TEXT.replace("06 12 34 56 78", "07 98 76 54 32").replace("2018 - 2020", "2018 - 2021")
+        second, education_calls, language_calls = self.parse(edited)
+        self.assertEqual(education_calls, 1)
+        self.assertEqual(language_calls, 0)
+        self.assertEqual(second["languages"], first["languages"])
+        self.assertEqual(second["personalInfo"]["phone"], "07 98 76 54 32")
+        self.assertEqual(second["meta"]["nearDuplicate"]["reusedSections"], ["experiences", "skills", "languages"])
+
+        fresh = ImprovedCVParser(time_budget=None)
+        with mock.patch.object(fresh, "read_pdf", return_value=PdfContent(edited, [], {}, [])):
+            expected = fresh.parse_cv("cv.pdf")
+        del second["meta"]
+        self.assertEqual(second, expected)
+
+
+@unittest.skipUnless(HAS_PDFPLUMBER, "pdfplumber n'est pas installé")
+class FixtureReuseTest(unittest.TestCase):
+    def test_reused_result_matches_a_fresh_parse(self):
+        index = NearDuplicateIndex(Path(tempfile.mkdtemp()) / "near-duplicates.sqlite")
+        self.addCleanup(index.close)
+        parser = ImprovedCVParser(time_budget=None, duplicate_index=index)
+        content = read_pdf(str(FIXTURE))
+        parser.parse_cv(str(FIXTURE))
+
+        # Ligne du bloc CONTACT lue par l'extracteur de formation
+        edited = content._replace(text=content.text.replace("INSA TOULOUSE - 2ème année", "INSA LYON - 2ème année"))
+        self.assertNotEqual(edited.text, content.text)
+        with mock.patch.object(parser, "read_pdf", return_value=edited):
+            reused = parser.parse_cv(str(FIXTURE))
+        fresh = ImprovedCVParser(time_budget=None)
+        with mock.patch.object(fresh, "read_pdf", return_value=edited):
+            expected = fresh.parse_cv(str(FIXTURE))
+
+        self.assertNotIn("education", reused["meta"]["nearDuplicate"]["reusedSections"])
+        del reused["meta"]
+        self.assertEqual(reused, expected)
+        self.assertEqual(reused["education"][0]["institution"], "INSA LYON")
+
+if __name__ == "__main__":
+    unittest.main()
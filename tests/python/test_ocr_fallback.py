@@ -0,0 +1,156 @@
+# test_ocr_fallback.py
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import ocr_fallback  # noqa: E402
+from ocr_fallback import OcrSettings, ocr_pages  # noqa: E402
+from parse_budget import ParseBudget  # noqa: E402
+
+
+class FakeStream:
+    def __init__(self, data):
+        self.data = data
+
+    def get_data(self):
+        return self.data
+
+    def get_rawdata(self):
+        return self.data
+
+
+class FakePage:
+    """Page scannée minimale : dimensions, flux de contenu, une image"""
+
+    def __init__(self, image_bytes):
+        self.width, self.height = 595, 842
+        self.page_obj = mock.Mock(contents=[FakeStream(b"q /Im0 Do Q")])
+        self.images = [{"stream": FakeStream(image_bytes)}]
+        self.image_bytes = image_bytes
+        self.rasterized = 0
+
+    def to_image(self, resolution):
+        page = self
+
+        class FakeImage:
+            def save(self, path, format):
+                page.rasterized += 1
+                Path(path).write_bytes(b"png-" + page.image_bytes)
+
+        return FakeImage()
+
+
+class OcrPagesTest(unittest.TestCase):
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.cache_dir = os.path.join(temp_dir.name, "ocr")
+        self.settings = OcrSettings(page_budget=2, cache_dir=self.cache_dir)
+
+    def test_ocr_results_are_cached_by_page_hash(self):
+        page = FakePage(b"scan-1")
+        with mock.patch.object(ocr_fallback, "_run_tesseract", return_value="Jean Dupont") as tesseract:
+            texts, stats = ocr_pages([(1, page)], self.settings)
+            self.assertEqual(texts, {1: "Jean Dupont"})
+            self.assertFalse(stats[0]["cached"])
+
+            # Même page dans un autre document : ni rastérisation ni Tesseract
+            texts, stats = ocr_pages([(3, FakePage(b"scan-1"))], self.settings)
+            self.assertEqual(texts, {3: "Jean Dupont"})
+            self.assertTrue(stats[0]["cached"])
+            self.assertEqual(tesseract.call_count, 1)
+            self.assertEqual(page.rasterized, 1)
+
+    @unittest.skipIf(sys.platform == "win32", "permissions POSIX")
+    def test_cache_is_private_and_keeps_no_page_images(self):
+        with mock.patch.object(ocr_fallback, "_run_tesseract", side_effect=["Jean Dupont", OSError("tesseract")]):
+            ocr_pages([(1, FakePage(b"scan-1")), (2, FakePage(b"scan-2"))], self.settings)
+        self.assertEqual(stat.S_IMODE(os.stat(self.cache_dir).st_mode), 0o700)
+        # Images des CVs supprimées après OCR, réussi ou non : seul le texte reste en cache
+        self.assertEqual([path.suffix for path in Path(self.cache_dir).iterdir()], [".txt"])
+
+    def test_repeated_page_is_recognized_once(self):
+        with mock.patch.object(ocr_fallback, "_run_tesseract", return_value="Jean Dupont") as tesseract:
+            texts, _ = ocr_pages([(1, FakePage(b"scan-1")), (2, FakePage(b"scan-1"))], self.settings)
+        self.assertEqual(texts, {1: "Jean Dupont", 2: "Jean Dupont"})
+        self.assertEqual(tesseract.call_count, 1)
+
+    def test_cache_evicts_old_entries_then_least_recently_used_beyond_its_size(self):
+        cache_dir = Path(self.cache_dir)
+        cache_dir.mkdir()
+        now = time.time()
+        for name, age in (("old", 7200), ("a", 300), ("b", 200), ("c", 100)):
+            path = cache_dir / f"{name}.txt"
+            path.write_text("x" * 1024)
+            os.utime(path, (now - age, now - age))
+        (cache_dir / "orphan.png").write_bytes(b"png")
+        os.utime(cache_dir / "orphan.png", (now - 7200, now - 7200))
+
+        ocr_fallback.evict_cache(cache_dir, OcrSettings(cache_max_mb=2.5 / 1024, cache_max_age=3600))
+        self.assertEqual(sorted(path.name for path in cache_dir.iterdir()), ["b.txt", "c.txt"])
+
+    def test_unreadable_pages_are_keyed_by_their_rasterized_image(self):
+        pages = []
+        for image_bytes in (b"scan-a", b"scan-b"):
+            page = FakePage(image_bytes)
+            page.page_obj = mock.Mock(contents=[])
+            page.images = []
+            pages.append(page)
+        self.assertIsNone(ocr_fallback.page_hash(pages[0]))
+
+        with mock.patch.object(ocr_fallback, "_run_tesseract", side_effect=["Jean Dupont", "Marie Curie"]):
+            texts, stats = ocr_pages([(1, pages[0]), (2, pages[1])], self.settings)
+        # Mêmes dimensions, scans différents : aucun texte partagé
+        self.assertEqual(texts, {1: "Jean Dupont", 2: "Marie Curie"})
+        self.assertEqual([stat["cached"] for stat in stats], [False, False])
+        self.assertEqual([page.rasterized for page in pages], [1, 1])
+
+    def test_respects_page_budget(self):
+        pages = [(i, FakePage(f"scan-{i}".encode())) for i in range(1, 5)]
+        with mock.patch.object(ocr_fallback, "_run_tesseract", return_value="texte"):
+            texts, stats = ocr_pages(pages, self.settings)
+        self.assertEqual(sorted(texts), [1, 2])
+        self.assertEqual([stat["page"] for stat in stats], [1, 2])
+
+    def test_failed_page_yields_empty_text_and_is_not_cached(self):
+        with mock.patch.object(ocr_fallback, "_run_tesseract", side_effect=OSError("tesseract")):
+            texts, _ = ocr_pages([(1, FakePage(b"scan-x"))], self.settings)
+        self.assertEqual(texts, {1: ""})
+        self.assertEqual(list(Path(self.cache_dir).glob("*.txt")), [])
+
+    def test_stops_at_the_document_deadline(self):
+        def slow_tesseract(image_path, settings, timeout):
+            time.sleep(0.5)
+            return "trop tard"
+
+        budget = ParseBudget(0.1)
+        started = time.monotonic()
+        with mock.patch.object(ocr_fallback, "_run_tesseract", side_effect=slow_tesseract) as tesseract:
+            texts, _ = ocr_pages([(1, FakePage(b"scan-slow"))], self.settings, budget)
+        self.assertLess(time.monotonic() - started, 0.4)
+        self.assertEqual(texts, {1: ""})
+        self.assertLessEqual(tesseract.call_args[0][2], 0.1)
+        self.assertEqual(budget.truncated_sections, ["ocr"])
+        self.assertEqual(list(Path(self.cache_dir).glob("*.txt")), [])
+
+    def test_no_page_is_started_after_the_deadline(self):
+        budget = ParseBudget(1e-9)
+        with mock.patch.object(ocr_fallback, "_run_tesseract") as tesseract:
+            texts, stats = ocr_pages([(1, FakePage(b"scan-late"))], self.settings, budget)
+        self.assertEqual((texts, stats), ({}, []))
+        tesseract.assert_not_called()
+
+    def test_disabled_without_request(self):
+        with mock.patch.dict("os.environ", {}, clear=True):
+            self.assertIsNone(ocr_fallback.settings_from_env())
+
+
+if __name__ == "__main__":
+    unittest.main()
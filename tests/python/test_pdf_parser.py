@@ -0,0 +1,97 @@
+# test_pdf_parser.py
+import importlib.util
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import pdf_parser  # noqa: E402
+from pdf_parser import CVParser  # noqa: E402
+from pdf_reader import PdfContent  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parents[1] / "e2e" / "fixtures" / "CV_test.pdf"
+HAS_PDFPLUMBER = importlib.util.find_spec("pdfplumber") is not None
+
+SECTION = (
+    "EXPÉRIENCE\n"
+    "Développeur chez Acme\n"
+    "Paris\n"
+    "2019 - 2021\n"
+    "Développement d'applications web en React et Node.js\n"
+    "Ingénieur chez Globex\n"
+    "Lyon\n"
+    "Septembre 2021 - Présent\n"
+    "Conception de services de données pour la logistique\n"
+)
+
+
+class DateBlocksTest(unittest.TestCase):
+    def setUp(self):
+        self.parser = CVParser()
+
+    def test_next_entry_header_stays_with_its_dates(self):
+        first, second = self.parser._find_date_blocks(SECTION)
+        self.assertNotIn("Globex", first["text"])
+        self.assertTrue(first["text"].endswith("React et Node.js\n"))
+        self.assertTrue(second["text"].startswith("Ingénieur chez Globex\nLyon\n"))
+
+    def test_inline_dates_split_at_their_own_line(self):
+        section = "EXPÉRIENCE\nDev chez Acme 2019 - 2021\nApplications web\nIngénieur chez Globex 2021 - présent\n"
+        first, second = self.parser._find_date_blocks(section)
+        self.assertEqual(second["text"], "Ingénieur chez Globex 2021 - présent\n")
+
+    def test_month_range_wins_over_the_month_alone(self):
+        [_, current] = self.parser._find_date_blocks(SECTION)
+        self.assertEqual(current["dates"], ("Septembre 2021", "Présent"))
+        self.assertEqual(self.parser._parse_start_date(current["dates"]), "Septembre 2021")
+        self.assertTrue(self.parser._is_current_position(current["dates"]))
+
+
+class PersonalInfoLinksTest(unittest.TestCase):
+    def test_metadata_urls_rank_below_annotations_and_header(self):
+        metadata = {"Producer": "www.ilovepdf.com", "Subject": "https://jdupont-old.fr"}
+        parser = CVParser()
+        content = PdfContent("Jean Dupont\nhttps://jdupont.fr\n", [], metadata, [])
+        self.assertEqual(parser.extract_personal_info(content.text, content)["website"], "https://jdupont.fr")
+        content = PdfContent("Jean Dupont\n", [], metadata, [])
+        self.assertEqual(parser.extract_personal_info(content.text, content)["website"], "https://jdupont-old.fr")
+
+
+class ParseBudgetTest(unittest.TestCase):
+    def test_budget_covers_pdf_reading(self):
+        def slow_read_pdf(pdf_path, ocr=None, budget=None):
+            time.sleep(0.05)
+            return PdfContent("Jean Dupont\n" + SECTION, [], {}, [])
+
+        with mock.patch.object(pdf_parser, "read_pdf", side_effect=slow_read_pdf):
+            result = CVParser(time_budget=0.01).parse_cv("cv.pdf")
+        self.assertTrue(result["meta"]["partial"])
+        self.assertEqual(result["experiences"], [])
+
+
+@unittest.skipUnless(HAS_PDFPLUMBER, "pdfplumber n'est pas installé")
+class FixtureSectionsTest(unittest.TestCase):
+    """CV de test sur deux colonnes : PROJETS avant EXPÉRIENCES, bloc CONTACT dans FORMATION"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.result = CVParser(time_budget=None).parse_cv(str(FIXTURE))
+
+    def test_experience_after_personal_projects_is_extracted(self):
+        [experience] = self.result["experiences"]
+        self.assertEqual((experience["position"], experience["startDate"]), ("Data Analyst", "2023"))
+
+    def test_education_continues_past_the_contact_block(self):
+        [education] = self.result["education"]
+        self.assertTrue(education["degree"].startswith("INSA TOULOUSE"))
+
+    def test_languages_and_skills_are_extracted(self):
+        self.assertEqual([language["name"] for language in self.result["languages"]], ["Anglais"])
+        self.assertIn("Typescript", {skill["name"] for skill in self.result["skills"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# test_pdf_reader.py
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from pdf_reader import classify_links, metadata_author, metadata_links  # noqa: E402
+from text_normalizer import header_region  # noqa: E402
+
+
+class ClassifyLinksTest(unittest.TestCase):
+    def test_sorts_annotation_uris_by_kind(self):
+        links = classify_links([
+            "mailto:jean.dupont@email.com?subject=CV",
+            "tel:+33612345678",
+            "https://www.linkedin.com/in/jean-dupont/",
+            "https://github.com/jdupont",
+            "https://jdupont.vercel.app",
+        ])
+        self.assertEqual(links["email"], ["jean.dupont@email.com"])
+        self.assertEqual(links["phone"], ["+33612345678"])
+        self.assertEqual(links["linkedin"], ["https://www.linkedin.com/in/jean-dupont/"])
+        self.assertEqual(links["github"], ["https://github.com/jdupont"])
+        self.assertEqual(links["web"], ["https://jdupont.vercel.app"])
+
+    def test_ignores_internal_links(self):
+        self.assertEqual(classify_links(["#page=2"])["web"], [])
+
+
+class MetadataTest(unittest.TestCase):
+    def test_extracts_urls_from_metadata_values(self):
+        metadata = {"Subject": "CV - linkedin.com/in/jdupont", "Creator": "Microsoft Word"}
+        self.assertIn("linkedin.com/in/jdupont", metadata_links(metadata))
+
+    def test_ignores_producer_and_creator(self):
+        metadata = {"Producer": "www.ilovepdf.com", "Creator": "https://www.canva.com", "Keywords": "jdupont.fr"}
+        self.assertEqual(metadata_links(metadata), ["jdupont.fr"])
+
+    def test_author_is_used_only_when_it_looks_like_a_name(self):
+        self.assertEqual(metadata_author({"Author": "Jean Dupont"}), "Jean Dupont")
+        self.assertEqual(metadata_author({"Author": "user01"}), "")
+        self.assertEqual(metadata_author({}), "")
+
+
+class HeaderRegionTest(unittest.TestCase):
+    def test_keeps_first_lines_and_a_later_contact_block(self):
+        lines = ["Jean Dupont"] + [f"ligne {i}" for i in range(20)] + [
+            "CONTACT", "github.com/jdupont", "FORMATION", "github.com/autre",
+        ]
+        region = header_region(lines, max_lines=5)
+        self.assertEqual(region[:5], lines[:5])
+        self.assertEqual(region[5:], ["CONTACT", "github.com/jdupont"])
+
+    def test_contact_block_starting_in_the_header_is_kept_whole(self):
+        # Mise en page du CV de test : CONTACT en ligne 9, lien LinkedIn en ligne 16
+        lines = ["Jean Dupont"] + [f"ligne {i}" for i in range(7)] + ["CONTACT"] + [
+            f"détail {i}" for i in range(6)] + ["in/jean-dupont", "PROJETS PERSONNELS", "in/autre"]
+        region = header_region(lines)
+        self.assertEqual(region[-1], "in/jean-dupont")
+        self.assertNotIn("in/autre", region)
+
+
+if __name__ == "__main__":
+    unittest.main()
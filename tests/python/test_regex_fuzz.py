@@ -0,0 +1,87 @@
+# test_regex_fuzz.py
+import random
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import cv_patterns  # noqa: E402
+from parse_budget import ParseBudget  # noqa: E402
+
+# Taille des entrées pathologiques et temps maximal accordé à chaque pattern
+INPUT_SIZE = 50_000
+PATTERN_BUDGET_SECONDS = 0.5
+
+
+def pathological_inputs():
+    """Textes PDF brouillés qui faisaient exploser les anciens patterns"""
+    rng = random.Random(42)
+    garbage = "".join(rng.choice("aZ9.-_/@+ \n") for _ in range(INPUT_SIZE))
+    return {
+        "long word without dot": "a" * INPUT_SIZE,
+        "long word then dot": "a" * INPUT_SIZE + ".",
+        "email local part without at": "a." * (INPUT_SIZE // 2),
+        "repeated at signs": "a@" * (INPUT_SIZE // 2),
+        "long digit run": "1" * INPUT_SIZE,
+        "slashes after domain": "site.com" + "/" * INPUT_SIZE,
+        "empty path segments": "site.com" + "/a/" * (INPUT_SIZE // 3),
+        "capitalized words without country": "Paris " * (INPUT_SIZE // 6),
+        "campus followed by letters": "Campus " + "A" * INPUT_SIZE,
+        "urls without tld": "https://" + "b" * INPUT_SIZE,
+        "random garbage": garbage,
+    }
+
+
+def all_patterns():
+    return {
+        name: value
+        for name, value in vars(cv_patterns).items()
+        if name.endswith("_PATTERN")
+    }
+
+
+class RegexFuzzBenchmark(unittest.TestCase):
+    def test_patterns_stay_linear_on_pathological_inputs(self):
+        for text_name, text in pathological_inputs().items():
+            for pattern_name, pattern in all_patterns().items():
+                with self.subTest(pattern=pattern_name, text=text_name):
+                    start = time.perf_counter()
+                    pattern.findall(text)
+                    elapsed = time.perf_counter() - start
+                    self.assertLess(elapsed, PATTERN_BUDGET_SECONDS)
+
+    def test_website_pattern_still_matches_urls(self):
+        text = "Portfolio: https://www.jean-dupont.fr/projets/cv/ et monblog.fr"
+        self.assertEqual(
+            cv_patterns.WEBSITE_PATTERN.findall(text),
+            ["https://www.jean-dupont.fr/projets/cv/", "monblog.fr"],
+        )
+
+    def test_phone_and_email_patterns_still_match(self):
+        text = "jean.dupont@email.com +33 6 12 34 56 78"
+        self.assertEqual(cv_patterns.EMAIL_PATTERN.search(text).group(), "jean.dupont@email.com")
+        self.assertEqual(cv_patterns.PHONE_FR_PATTERN.search(text).group(), "+33 6 12 34 56 78")
+
+
+class ParseBudgetTest(unittest.TestCase):
+    def test_unlimited_budget_never_expires(self):
+        budget = ParseBudget(None)
+        self.assertFalse(budget.exhausted("skills"))
+        self.assertFalse(budget.partial)
+
+    def test_expired_budget_records_truncated_sections(self):
+        budget = ParseBudget(1e-9)
+        time.sleep(0.001)
+        self.assertTrue(budget.exhausted("experiences"))
+        self.assertTrue(budget.exhausted("experiences"))
+        self.assertTrue(budget.exhausted("skills"))
+        self.assertEqual(
+            budget.meta(),
+            {"partial": True, "truncatedSections": ["experiences", "skills"], "timeBudget": 1e-9},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
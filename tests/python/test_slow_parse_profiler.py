@@ -0,0 +1,108 @@
+# test_slow_parse_profiler.py
+import json
+import os
+import pstats
+import signal
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+from slow_parse_profiler import ProfilerSettings, profiled_parse, settings_from_env  # noqa: E402
+
+# Processus enfant dont le parsing ne se termine jamais : seul SIGTERM l'arrête
+HANGING_CHILD = '''
+import sys, time
+from slow_parse_profiler import ProfilerSettings, profiled_parse
+
+def hanging_parse(pdf_path):
+    print("ready", flush=True)
+    while True:
+        time.sleep(0.01)
+
+profiled_parse(hanging_parse, sys.argv[1], ProfilerSettings(output_dir=sys.argv[2]))
+'''
+
+
+def allocating_parse(pdf_path):
+    """Parsing factice qui garde ~2 Mo alloués"""
+    return {"personalInfo": {}, "blob": [bytearray(1024) for _ in range(2048)]}
+
+
+class SlowParseProfilerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.pdf = self.root / "cv.pdf"
+        self.pdf.write_bytes(b"%PDF-1.4 contenu confidentiel")
+        self.output_dir = self.root / "profiles"
+
+    def settings(self, **overrides):
+        values = {"output_dir": str(self.output_dir), "latency_threshold": 60.0, "memory_threshold_mb": 1.0}
+        values.update(overrides)
+        return ProfilerSettings(**values)
+
+    def reports(self):
+        return sorted(self.output_dir.glob("*.json"))
+
+    def test_memory_threshold_saves_profile_and_report(self):
+        result = profiled_parse(allocating_parse, str(self.pdf), self.settings())
+        self.assertIn("blob", result)
+
+        [report_path] = self.reports()
+        report = json.loads(report_path.read_text())
+        self.assertEqual(len(report["pdfSha256"]), 64)
+        self.assertGreaterEqual(report["peakMemoryMb"], 1.0)
+        self.assertTrue(report["topAllocations"])
+        self.assertNotIn(str(self.pdf), report_path.read_text())
+        self.assertNotIn("confidentiel", report_path.read_text())
+        stats = pstats.Stats(str(report_path.with_suffix(".prof")))
+        self.assertTrue(any(func[2] == "allocating_parse" for func in stats.stats))
+
+    def test_fast_documents_are_not_captured(self):
+        profiled_parse(lambda path: {}, str(self.pdf), self.settings(memory_threshold_mb=100.0))
+        self.assertFalse(self.output_dir.exists())
+
+    def test_captures_are_rate_limited(self):
+        for _ in range(3):
+            profiled_parse(allocating_parse, str(self.pdf), self.settings())
+        self.assertEqual(len(self.reports()), 1)
+
+    def test_failed_parse_is_captured_and_reraised(self):
+        def failing_parse(pdf_path):
+            allocating_parse(pdf_path)
+            raise ValueError("PDF illisible")
+
+        with self.assertRaises(ValueError):
+            profiled_parse(failing_parse, str(self.pdf), self.settings(latency_threshold=0.0))
+        [report_path] = self.reports()
+        self.assertEqual(json.loads(report_path.read_text())["error"], "ValueError: PDF illisible")
+
+    @unittest.skipIf(sys.platform == "win32", "SIGTERM n'existe pas sous Windows")
+    def test_parse_killed_by_sigterm_is_captured(self):
+        # route.ts tue le processus après PYTHON_TIMEOUT, bien avant le seuil de latence
+        child = subprocess.Popen([sys.executable, "-c", HANGING_CHILD, str(self.pdf), str(self.output_dir)],
+                                 stdout=subprocess.PIPE, text=True, env={**os.environ, "PYTHONPATH": str(SCRIPTS_DIR)})
+        self.addCleanup(child.stdout.close)
+        self.assertEqual(child.stdout.readline().strip(), "ready")
+        child.send_signal(signal.SIGTERM)
+        self.assertEqual(child.wait(timeout=30), -signal.SIGTERM)
+
+        [report_path] = self.reports()
+        self.assertEqual(json.loads(report_path.read_text())["error"], "Interrompu par SIGTERM")
+        stats = pstats.Stats(str(report_path.with_suffix(".prof")))
+        self.assertTrue(any(func[2] == "hanging_parse" for func in stats.stats))
+
+    def test_settings_are_opt_in(self):
+        with mock.patch.dict(os.environ, {}, clear=True):
+            self.assertIsNone(settings_from_env())
+        with mock.patch.dict(os.environ, {"CV_GENIUS_PROFILE": "1", "CV_GENIUS_PROFILE_LATENCY": "5"}):
+            self.assertEqual(settings_from_env().latency_threshold, 5.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# test_text_normalizer.py
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+from text_normalizer import NormalizedText, as_document, classify_header, header_key, repair_text  # noqa: E402
+
+
+class RepairTextTest(unittest.TestCase):
+    def test_recombines_spacing_accents(self):
+        self.assertEqual(repair_text("expe´rience"), "expérience")
+
+    def test_expands_ligatures(self):
+        self.assertEqual(repair_text("ﬁnance"), "finance")
+
+    def test_keeps_regular_accents(self):
+        self.assertEqual(repair_text("Hélène Dupré"), "Hélène Dupré")
+
+
+class ClassifyHeaderTest(unittest.TestCase):
+    def test_matches_known_headers_regardless_of_case_and_accents(self):
+        self.assertEqual(classify_header("EXPÉRIENCE PROFESSIONNELLE"), "experience")
+        self.assertEqual(classify_header("Experiences professionnelles :"), "experience")
+        self.assertEqual(classify_header("expe´rience"), "experience")
+        self.assertEqual(classify_header("Compétences techniques"), "skills")
+        self.assertEqual(classify_header("LANGUES"), "languages")
+        self.assertEqual(classify_header("1. Formation"), "education")
+
+    def test_stop_headers_are_classified_as_other(self):
+        self.assertEqual(classify_header("Centres d’intérêt"), "other")
+
+    def test_ignores_body_text_containing_keywords(self):
+        self.assertIsNone(classify_header("J'ai une expérience solide en Python"))
+        self.assertIsNone(classify_header("Formation continue aux outils de la gestion de projet"))
+
+    def test_header_key_is_singular_and_folded(self):
+        self.assertEqual(header_key("Compétences Techniques"), "competence technique")
+
+
+class NormalizedTextTest(unittest.TestCase):
+    RAW = "Jean  Dupont\n\n• expe´rience\nDev chez Acme\n\nLANGUES\nAnglais"
+
+    def test_builds_line_and_flat_views_once(self):
+        doc = NormalizedText(self.RAW)
+        self.assertEqual(doc.lines, ["Jean Dupont", "- expérience", "Dev chez Acme", "LANGUES", "Anglais"])
+        self.assertEqual(doc.text, "Jean Dupont\n- expérience\nDev chez Acme\nLANGUES\nAnglais")
+        self.assertEqual(doc.flat, "Jean Dupont - expérience Dev chez Acme LANGUES Anglais")
+        self.assertIs(doc.flat, doc.flat)
+
+    def test_offsets_are_shared_between_views(self):
+        doc = NormalizedText(self.RAW)
+        offset = doc.flat.index("Acme")
+        self.assertEqual(doc.text[offset:offset + 4], "Acme")
+        self.assertEqual(doc.lines[doc.line_at(offset)], "Dev chez Acme")
+        self.assertEqual(doc.line_at(doc.line_offsets[3]), 3)
+
+    def test_sections_run_until_next_header(self):
+        doc = NormalizedText("EXPÉRIENCE\nDev\nFORMATION\nMaster\nLANGUES\nAnglais")
+        self.assertEqual(doc.section_lines("education"), ["FORMATION", "Master"])
+        self.assertEqual(doc.section_text("languages"), "LANGUES\nAnglais\n")
+        self.assertEqual(doc.section_text("skills"), "")
+
+    def test_sections_of_the_same_type_are_merged(self):
+        doc = NormalizedText("PROJETS PERSONNELS\nSite web\nEXPÉRIENCE\nDev\nFORMATION\nMaster\nEXPERIENCE\nStage")
+        self.assertEqual(doc.section_lines("experience"), ["EXPÉRIENCE", "Dev", "EXPERIENCE", "Stage"])
+        self.assertEqual(doc.section_lines("projects"), ["PROJETS PERSONNELS", "Site web"])
+
+    def test_contact_block_does_not_end_a_section(self):
+        doc = NormalizedText("FORMATION\n2023 - présent\nCONTACT\nINSA Toulouse - Ingénieur\nLANGUES\nAnglais")
+        self.assertEqual(doc.section_lines("education")[-1], "INSA Toulouse - Ingénieur")
+
+    def test_two_column_header_row_shares_the_body(self):
+        doc = NormalizedText("EXPÉRIENCES\nCERTIFICATS\nData Analyst 2023\nReact Avancé\nLANGUES\nAnglais")
+        self.assertEqual(doc.section_lines("experience"),
+                         ["EXPÉRIENCES", "CERTIFICATS", "Data Analyst 2023", "React Avancé"])
+
+    def test_as_document_reuses_normalized_text(self):
+        doc = NormalizedText(self.RAW)
+        self.assertIs(as_document(doc), doc)
+
+
+if __name__ == "__main__":
+    unittest.main()